@@ -0,0 +1,64 @@
+"""configuration.py
+
+Provide YAML configuration file input for the dgstools scripts.
+
+Requires: PyYAML
+
+Language: Python 3
+
+"""
+
+import copy
+import functools
+import os
+
+import yaml
+
+# use libyaml C parser if available
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+################################################################
+# configuration input
+################################################################
+
+@functools.lru_cache(maxsize=None)
+def _read_config_cached(filename,mtime_ns,size):
+    """Parse YAML configuration file.
+
+    This is a helper function for internal use by read_config.  The file
+    modification time and size are included as arguments only so that they
+    form part of the cache key.
+
+    Arguments:
+        filename (str) : filename for configuration file
+        mtime_ns (int) : file modification time (ns)
+        size (int) : file size (bytes)
+
+    Returns:
+        (dict) : configuration parameters
+    """
+
+    with open(filename,"r") as f:
+        config = yaml.load(f,Loader=SafeLoader)
+    return config
+
+def read_config(filename):
+    """Read YAML configuration file.
+
+    Parsed contents are cached on (filename, mtime, size), so a repeated read
+    of an unchanged file does not reparse the YAML.  A copy is returned, so the
+    caller may freely modify the result.
+
+    Arguments:
+        filename (str) : filename for configuration file
+
+    Returns:
+        (dict) : configuration parameters
+    """
+
+    stat_result = os.stat(filename)
+    config = _read_config_cached(filename,stat_result.st_mtime_ns,stat_result.st_size)
+    return copy.deepcopy(config)
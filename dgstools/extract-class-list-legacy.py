@@ -32,8 +32,10 @@ University of Notre Dame
 """
 
 import datetime
-import yaml
+import io
+import operator
 
+import configuration
 import spreadsheet
 
 ################################################################
@@ -66,6 +68,7 @@ def generate_database(database_filename):
 
         course
         section
+        short_instructor
 
     Returns:
        (list of dict) : list of student records
@@ -81,12 +84,13 @@ def generate_database(database_filename):
     for entry in database:
         # split out section number from course number
         #   also clean up any terminal "*" on section number
-        course_section_parts = entry["course-section"].split("-")
-        entry["course"] = course_section_parts[0]
-        entry["section"] = ""
-        if len(course_section_parts)>1:
-            entry["section"] = course_section_parts[1]
-        entry["section"] = entry["section"].rstrip("*")
+        #   (any further dash-separated parts after the section are dropped)
+        course, _, section = entry["course-section"].partition("-")
+        section = section.partition("-")[0]
+        entry["course"] = course
+        entry["section"] = section.rstrip("*")
+        # short instructor name, as in extract-class-list database
+        entry["short_instructor"] = entry["instructor"].split(",")[0]
 
     return database
 
@@ -102,18 +106,15 @@ def generate_course_report(filename,database):
         database (list of dict) : student database
     """
 
-    report_stream = open(filename,"w")
-
+    # accumulate report text
+    report_buffer = io.StringIO()
+    report_fields = operator.itemgetter("course","title","short_instructor","when")
     for entry in database:
-        short_instructor = entry["instructor"].split(",")[0]
-        print(
-            "{course} / {title} / {short_instructor} / {when}"
-            "".format(short_instructor=short_instructor,**entry),
-            file = report_stream
-        )
-                
-            
-    report_stream.close()
+        report_buffer.write("{} / {} / {} / {}\n".format(*report_fields(entry)))
+
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write(report_buffer.getvalue())
 
 ################################################################
 # main program
@@ -122,13 +123,11 @@ def generate_course_report(filename,database):
 if (__name__=="__main__"):
 
     # read configuration
-    with open("extract-class-list-legacy.yml", "r") as f:
-        config = yaml.safe_load(f)
+    config = configuration.read_config("extract-class-list-legacy.yml")
 
     # set date
     date_string = config.get("date")
-    month, day, year = tuple(map(int,date_string.split("/")))
-    today = datetime.date(year, month, day)
+    today = datetime.datetime.strptime(date_string, "%m/%d/%Y").date()
     date_code = today.strftime("%y%m%d")
 
     # read class schedule
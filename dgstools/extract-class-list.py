@@ -12,6 +12,8 @@ The config file "process-students.yml" is a YAML file with the following keys:
     term (str): term as <yyx> ("a"=spring, "b"=fall)
     database_filename (str): path to registrar class spreadsheet (CSV)
     course_blacklist (list of str): course numbers to omit from report
+    skip_if_current (bool, optional): skip regeneration if outputs are newer
+        than database and config file
 
 Invocation:
 
@@ -32,8 +34,13 @@ University of Notre Dame
 
 import csv
 import datetime
-import yaml
+import functools
+import operator
+import os
+import re
+import sys
 
+import configuration
 import spreadsheet
 
 ################################################################
@@ -48,6 +55,74 @@ import spreadsheet
 # Course Attributes,Enrollment,Maximum Enrollment,Prior Enrollment,Cross-listings,Cross-list Maximum,
 # Internal Memo to the Registrar,Comments (will display in class search)#1,Comments (will display in class search)#2
 
+# simple fields copied from CourseLeaf entry to database entry
+courseleaf_field_by_field = {
+    "course": "Course",
+    "section": "Section #",
+    "crn": "CRN",
+    "enrollment": "Enrollment",
+    "max_enrollment": "Maximum Enrollment",
+    "xlist": "Cross-listings",
+    "title": "Course Title",
+    "when": "Meeting Pattern",
+    "where": "Room",
+}
+
+################################################################
+# instructor parsing
+################################################################
+
+# single instructor entry from CourseLeaf instructor field
+#
+#   "Lastname, Firstname [Middle] (NETID) [...]" -> last, first
+#   "... To Be Determined ..." -> tbd
+instructor_regex = re.compile(r"(?P<tbd>.*To Be Determined)?(?P<last>.*?)(?:, (?P<first>[^ ]*)|$)")
+
+def parse_instructor_single(instructor):
+    """Parse *single* instructor entry from CourseLeaf instructor field.
+
+    This is a helper function for internal use by parse_instructor.
+
+    Arguments:
+        instructor (str) : instructor entry, e.g., "Howk, Chris (JHOWK) [Primary, 50%]"
+
+    Returns:
+        (tuple of str) : (instructor,short_instructor), e.g., ("Howk, Chris","Howk")
+    """
+
+    match = instructor_regex.match(instructor.strip())
+    if match.group("tbd") is not None:  # trap TBD instructor
+        return "TBD", "TBD"
+    last = match.group("last")
+    first = match.group("first") or ""
+    return "{}, {}".format(last,first), last
+
+@functools.lru_cache(maxsize=None)
+def parse_instructor(raw_instructor):
+    """Parse CourseLeaf instructor field into long and short instructor names.
+
+    The same instructor field typically recurs across many sections (e.g.,
+    lab sections of a course), so results are memoized on the raw field value.
+
+    Arguments:
+        raw_instructor (str) : CourseLeaf instructor field, e.g.,
+            "Howk, Chris (JHOWK) [Primary, 50%]; Rudenga, Kristi (KRUDENGA) [50%]"
+
+    Returns:
+        (tuple of str) : (instructor,short_instructor), e.g.,
+            ("Howk, Chris & Rudenga, Kristi","Howk & Rudenga")
+    """
+
+    # common case: single instructor
+    if ";" not in raw_instructor:
+        return parse_instructor_single(raw_instructor)
+
+    raw_instructor_list = raw_instructor.split(";")  # split multiple instructors on semicolon
+    instructor_pairs = map(parse_instructor_single,raw_instructor_list)  # ("Lastname, Firstname","Lastname") or TBD
+    instructor_list, short_instructor_list = zip(*instructor_pairs)
+
+    return " & ".join(instructor_list), " & ".join(short_instructor_list)
+
 ################################################################
 # data input
 ################################################################
@@ -75,34 +150,38 @@ def read_spreadsheet_courseleaf(filename,debug=False):
 
     """
 
-    spreadsheet_table = spreadsheet.read_spreadsheet_table(filename,debug=debug)
-    
+    # stream rows from cleaned-up input (rather than materializing full table)
+    clean_stream = spreadsheet.read_spreadsheet_clean_stream(filename,debug=debug)
+    reader = csv.reader(clean_stream)
+
+    # skip annotation lines
+    next(reader)
+    next(reader)
 
     # read field list
-    field_list = spreadsheet_table[2][1:]
+    field_list = list(map(spreadsheet.clean_up,next(reader)[1:]))
 
     # parse spreadsheet body
     data = []
-    for row in spreadsheet_table[3:]:
-        if row[0] != "":
+    for row in reader:
+        if spreadsheet.clean_up(row[0]) != "":
             continue
-        values = row[1:]
+        values = list(map(spreadsheet.clean_up,row[1:]))
         if debug:
             print(values)
-        entry = {}
-        for field, value in zip(field_list, values):
-            entry[field] = value
-        data.append(entry)
+        data.append(dict(zip(field_list, values)))
 
     return data
 
-def generate_database(database_filename, course_blacklist=[], debug=False):
+def generate_database(database_filename, course_blacklist=None, debug=False):
     """ Read CSV database and postprocess fields.
 
     Arguments:
 
         database_filename (str): past to registrar class schedule spreadsheet (CSV)
 
+        course_blacklist (set-like of str, optional): course numbers to omit
+
     Generated fields:
 
         course
@@ -118,41 +197,26 @@ def generate_database(database_filename, course_blacklist=[], debug=False):
         debug=debug
     )
 
+    if course_blacklist is None:
+        course_blacklist = frozenset()
+
+    # set up field copying (C-level lookup of all simple fields at once)
+    simple_fields = tuple(courseleaf_field_by_field.keys())
+    get_courseleaf_fields = operator.itemgetter(*courseleaf_field_by_field.values())
+
     # process fields
     data = []
     for courseleaf_entry in courseleaf_data:
-        entry = {}
+
+        # skip blacklisted course before doing any further processing
+        if courseleaf_entry["Course"] in course_blacklist:
+            continue
 
         # copy simple fields
-        entry["course"] = courseleaf_entry["Course"]
-        entry["section"] = courseleaf_entry["Section #"]
-        entry["crn"] = courseleaf_entry["CRN"]
-        entry["enrollment"] = courseleaf_entry["Enrollment"]
-        entry["max_enrollment"] = courseleaf_entry["Maximum Enrollment"]
-        entry["xlist"] = courseleaf_entry["Cross-listings"]
-        entry["title"] = courseleaf_entry["Course Title"]
-        entry["when"] = courseleaf_entry["Meeting Pattern"]
-        entry["where"] = courseleaf_entry["Room"]
-        
+        entry = dict(zip(simple_fields,get_courseleaf_fields(courseleaf_entry)))
+
         # process instructor
-        raw_instructor = courseleaf_entry["Instructor"]
-        # e.g., "Howk, Chris (JHOWK) [Primary, 50%]; Rudenga, Kristi (KRUDENGA) [50%]"
-        raw_instructor_list = raw_instructor.split(";")  # split multiple instructors on semicolon
-        instructor_list = []  # collection of "Lastname, Firstname" or TBD
-        short_instructor_list = []  # collection of "Lastname" or TBD
-        for instructor in raw_instructor_list:
-            if instructor.find("To Be Determined") >=0:  # trap TBD instructor
-                instructor_list.append("TBD")
-                short_instructor_list.append("TBD")
-                continue
-            last, _, rest = instructor.strip().partition(", ")  # peel off last name
-            first, _, _ = rest.partition(" ")  # peel off first name
-            instructor_list.append("{}, {}".format(last,first))
-            short_instructor_list.append(last)
-        entry["instructor"] = " & ".join(instructor_list)
-        entry["short_instructor"] = " & ".join(short_instructor_list)
-        if entry["course"] in course_blacklist:
-            continue
+        entry["instructor"], entry["short_instructor"] = parse_instructor(courseleaf_entry["Instructor"])
         data.append(entry)
         if debug:
             print(entry)
@@ -171,17 +235,15 @@ def generate_course_report(filename,database):
         database (list of dict) : student database
     """
 
-    report_stream = open(filename,"w")
+    report_fields = operator.itemgetter("course","title","short_instructor","when")
+    report_lines = [
+        "{} / {} / {} / {}\n".format(*report_fields(entry))
+        for entry in database
+    ]
 
-    for entry in database:
-        print(
-            "{course} / {title} / {short_instructor} / {when}"
-            "".format(**entry),
-            file = report_stream
-        )
-                
-            
-    report_stream.close()
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.writelines(report_lines)
 
 def generate_course_spreadsheet(filename,database):
     """Generate spreadsheet of course info, as starting point for TA assignments.
@@ -197,15 +259,35 @@ def generate_course_spreadsheet(filename,database):
         "title", "instructor", "when", "where"
     ]
     
-    with open(filename, 'w', newline='') as csvfile:
+    with open(filename, 'w', newline='', buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as csvfile:
         csv_writer = csv.writer(csvfile)
         csv_writer.writerow(output_fields)
-        
-        for entry in database:
-            csv_writer.writerow([entry[field] for field in output_fields])
+        csv_writer.writerows(map(operator.itemgetter(*output_fields),database))
                 
             
 
+################################################################
+# output freshness check
+################################################################
+
+def outputs_current(output_filenames,input_filenames):
+    """Check whether all output files exist and are newer than all input files.
+
+    Arguments:
+        output_filenames (list of str) : output filenames
+        input_filenames (list of str) : input filenames
+
+    Returns:
+        (bool) : whether or not outputs are current
+    """
+
+    try:
+        output_mtime = min(os.stat(filename).st_mtime_ns for filename in output_filenames)
+    except FileNotFoundError:
+        return False
+    input_mtime = max(os.stat(filename).st_mtime_ns for filename in input_filenames)
+    return output_mtime >= input_mtime
+
 ################################################################
 # main program
 ################################################################
@@ -213,23 +295,31 @@ def generate_course_spreadsheet(filename,database):
 if (__name__=="__main__"):
 
     # read configuration
-    with open("extract-class-list.yml", "r") as f:
-        config = yaml.safe_load(f)
-    course_blacklist = config["course_blacklist"]
+    config = configuration.read_config("extract-class-list.yml")
+    course_blacklist = frozenset(config["course_blacklist"])
 
     # set date
     date_string = config.get("date")
-    month, day, year = tuple(map(int,date_string.split("/")))
-    today = datetime.date(year, month, day)
+    today = datetime.datetime.strptime(date_string, "%m/%d/%Y").date()
     date_code = today.strftime("%y%m%d")
-    
-    # read class schedule
+
+    # set filenames
     database_filename = config["database_filename"]
+    term = config["term"]
+    report_filename = "classes-{}-{}.txt".format(term, date_code)
+    spreadsheet_filename = "classes-{}-{}.csv".format(term, date_code)
+
+    # skip regeneration if outputs are up to date
+    if config.get("skip_if_current", False) and outputs_current(
+            [report_filename,spreadsheet_filename],
+            [database_filename,"extract-class-list.yml"]
+    ):
+        print("{}, {} are current".format(report_filename,spreadsheet_filename))
+        sys.exit()
+
+    # read class schedule
     database = generate_database(database_filename,course_blacklist,debug=False)
 
     # generate report
-    term = config["term"]
-    report_filename = "classes-{}-{}.txt".format(term, date_code)
     generate_course_report(report_filename,database)
-    spreadsheet_filename = "classes-{}-{}.csv".format(term, date_code)
     generate_course_spreadsheet(spreadsheet_filename,database)
@@ -39,14 +39,16 @@ University of Notre Dame
 
 """
 
-import yaml
+import functools
 
+import configuration
 import spreadsheet
 
 ################################################################
 # tools
 ################################################################
 
+@functools.lru_cache(maxsize=None)
 def term_name_from_term(term):
     """ Convert term code as as <yyx> to full term name.
 
@@ -135,15 +137,20 @@ def generate_database(response_filename, prolog, epilog, courses):
         skip=True,debug=False,
     )
     
-    # add name (as "last, first") as sorting key
-    for entry in database:
-        entry["name"] = "{last}, {first}".format(**entry)
-
     # sort by name
     ## database.sort(key=(lambda entry : entry["name"]))  # can use operator.itemgetter
-   
-    # process radio buttons
+
+    # postprocess entries (in a single pass)
     for entry in database:
+
+        # add name (as "last, first") as sorting key
+        #
+        # The uppercased form is computed once here, for case-insensitive
+        # sorting in each of the reports.
+        entry["name"] = f"{entry['last']}, {entry['first']}"
+        entry["sort_name"] = entry["name"].upper()
+
+        # process radio buttons
         spreadsheet.convert_fields_to_tagged_lines(
             entry, courses,
             prefix="    ",prune=True
@@ -151,6 +158,20 @@ def generate_database(response_filename, prolog, epilog, courses):
 
     return database
 
+################################################################
+# reports
+################################################################
+
+# text block for each faculty member in report_by_faculty
+faculty_block_template = (
+    "Name: {last}, {first}\n"
+    "Continue? {continue}\n"
+    "Understanding? {agreement}\n"
+    "Comments/info? {comments}\n"
+    "New/other? {other}\n"
+    "{preference_block}"  # string contains all needed newlines
+)
+
 def report_by_faculty(filename, database, term_name, courses):
     """Generate report of preferences by faculty.
 
@@ -166,49 +187,42 @@ def report_by_faculty(filename, database, term_name, courses):
 
     """
 
-    report_stream = open(filename,"w")
-
-    # header
-    print(
-        "Teaching requests by faculty member\n"
-        "{term_name}\n"
-        "".format(term_name=term_name),
-        file=report_stream
-    )
-
-    # generate output tabulation
-    tagged_blocks = dict()
-    for entry in database:
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
 
-        # collect preference lines
-        #
-        # These will be null strings if empty, or newline terminated
-        # if populated, so they can safely be concatenated with no
-        # delimiter.
-
-        preference_lines = [
-            entry[field_name]
-            for field_name in courses
-        ]
-        preference_block = "".join(preference_lines)
-
-        # generate text block for entry
-        entry_block = (""
-                        "Name: {last}, {first}\n"
-                        "Continue? {continue}\n"
-                        "Understanding? {agreement}\n"
-                        "Comments/info? {comments}\n"
-                        "New/other? {other}\n"
-                        "{preference_block}"  # string contains all needed newlines
-                        "".format(preference_block=preference_block,**entry)
+        # header
+        print(
+            "Teaching requests by faculty member\n"
+            "{term_name}\n"
+            "".format(term_name=term_name),
+            file=report_stream
         )
-        tagged_blocks[entry["name"].upper()] = entry_block  # force case for sorting purposes
 
-    # generate sorted output
-    for key in sorted(tagged_blocks.keys()):
-        print(tagged_blocks[key],file=report_stream)
+        # generate output tabulation
+        tagged_blocks = dict()
+        for entry in database:
 
-    report_stream.close()
+            # collect preference lines
+            #
+            # These will be null strings if empty, or newline terminated
+            # if populated, so they can safely be concatenated with no
+            # delimiter.
+
+            preference_lines = [
+                entry[field_name]
+                for field_name in courses
+            ]
+
+            # generate text block for entry
+            entry_block = faculty_block_template.format_map(
+                {**entry, "preference_block": "".join(preference_lines)}
+            )
+            tagged_blocks[entry["sort_name"]] = entry_block  # force case for sorting purposes
+
+        # generate sorted output
+        report_stream.writelines(
+            block+"\n"
+            for (_, block) in sorted(tagged_blocks.items())
+        )
 
 
 def report_by_course(filename, database, term_name, courses):
@@ -226,52 +240,56 @@ def report_by_course(filename, database, term_name, courses):
 
     """
 
-    report_stream = open(filename,"w")
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
 
-    # header
-    print(
-        "Teaching requests by course\n"
-        "{term_name}\n"
-        "".format(term_name=term_name),
-        file=report_stream
-    )
-
-    # generate output tabulation
-    tagged_blocks = dict()
-    for course_name in courses:
+        # header
+        print(
+            "Teaching requests by course\n"
+            "{term_name}\n"
+            "".format(term_name=term_name),
+            file=report_stream
+        )
 
-        
-        # collect preference lines for that course
-        preference_lines = dict()
+        # collect preference lines by course, keyed by (ranking, sort name)
+        #
+        # This is done in a single pass through the database, rather than one pass
+        # per course.  Keying on (ranking, sort name) drops only exact duplicate
+        # preferences (e.g., from a resubmission).
+        preference_lines_by_course = {course_name: {} for course_name in courses}
         for entry in database:
-
-            # skip if no preference entered
-            if (entry[course_name]==""):
-                continue
-                
-            # extract ranking back out of field
-            ranking = entry[course_name].split()[-1]
-            name = entry["name"]
-            sort_key = (ranking,name.upper())
-
-            preference_lines[sort_key] = "    {name}: {ranking}\n".format(ranking=ranking,**entry)
-            
-        # generate text block for entry
-        preference_block = ""
-        for key in sorted(preference_lines.keys()):
-            preference_block += preference_lines[key]
-
-        entry_block = ("{course_name}\n"
-                       "{preference_block}"  # string contains all needed newlines
-                       "".format(course_name=course_name,preference_block=preference_block)
-                   )
-        tagged_blocks[course_name] = entry_block
-
-    # generate sorted output
-    for key in sorted(tagged_blocks.keys()):
-        print(tagged_blocks[key],file=report_stream)
-
-    report_stream.close()
+            for course_name in courses:
+
+                # skip if no preference entered
+                if (entry[course_name]==""):
+                    continue
+
+                # extract ranking back out of field
+                #
+                # The ranking is the last word of the tagged line, which still
+                # carries its terminal newline, so split from the right.
+                ranking = entry[course_name].rsplit(None,1)[-1]
+
+                preference_lines_by_course[course_name][(ranking,entry["sort_name"])] = f"    {entry['name']}: {ranking}\n"
+
+        # generate output tabulation
+        tagged_blocks = dict()
+        for course_name in courses:
+
+            # generate text block for entry
+            preference_lines = preference_lines_by_course[course_name]
+            preference_block = "".join(line for (_, line) in sorted(preference_lines.items()))
+
+            entry_block = ("{course_name}\n"
+                           "{preference_block}"  # string contains all needed newlines
+                           "".format(course_name=course_name,preference_block=preference_block)
+                       )
+            tagged_blocks[course_name] = entry_block
+
+        # generate sorted output
+        report_stream.writelines(
+            block+"\n"
+            for (_, block) in sorted(tagged_blocks.items())
+        )
 
 
 ################################################################
@@ -281,8 +299,7 @@ def report_by_course(filename, database, term_name, courses):
 if (__name__=="__main__"):
 
     # read configuration
-    with open("extract-course-request.yml", "r") as f:
-        config = yaml.safe_load(f)
+    config = configuration.read_config("extract-course-request.yml")
     response_filename = config["response_filename"]
     term = config["term"]
     term_name = term_name_from_term(term)
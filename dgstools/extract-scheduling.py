@@ -25,8 +25,7 @@ University of Notre Dame
 
 """
 
-import yaml
-
+import configuration
 import spreadsheet
 
 ################################################################
@@ -59,8 +58,7 @@ import spreadsheet
 if (__name__=="__main__"):
 
     # read configuration
-    with open("extract-scheduling.yml", "r") as f:
-        config = yaml.safe_load(f)
+    config = configuration.read_config("extract-scheduling.yml")
     response_filename = config["response_filename"]
     report_filename  = config["report_filename"]
     print("{} -> {}".format(response_filename,report_filename))
@@ -78,35 +76,39 @@ if (__name__=="__main__"):
     field_names += [
         "comments",
     ]
-    table = spreadsheet.read_spreadsheet_dictionary(
+    table = spreadsheet.iter_spreadsheet_dictionary(
         response_filename,
         field_names,
         skip=True
     )
 
     # filter out test submissions
-    table = list(filter((lambda row : row["last"] not in ["TEST"]),table))
+    table = [row for row in table if row["last"]!="TEST"]
 
     # sort by (lastname, firstname)
     table.sort(key=(lambda row : (row["last"].upper(),row["first"].upper())))
 
     # generate report tabulation
-    report_stream = open(report_filename,"w")
-
-    # generate header line
-    entries = ["{:{}} ".format("", name_width)]
-    for date in dates:
-        entries.append("{:{}s}".format(date,date_width))
-    output_line = "".join(entries)
-    print(output_line,file=report_stream)
-
-    # generate respondent rows
-    for row in table:
-        ## print(row)
-        full_name = "{last}, {first}".format(**row)
-        entries = ["{:{}} ".format(full_name, name_width)]
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+
+        # generate header line
+        entries = ["{:{}} ".format("", name_width)]
         for date in dates:
-            entries.append("{:{}s}".format(response_codes[row[date]],date_width))
-        entries.append("{comments}".format(**row))
+            entries.append("{:{}s}".format(date,date_width))
         output_line = "".join(entries)
         print(output_line,file=report_stream)
+
+        # generate respondent rows
+        padded_code_by_response = {
+            response: "{:{}s}".format(code,date_width)
+            for (response, code) in response_codes.items()
+        }
+        for row in table:
+            ## print(row)
+            full_name = "{last}, {first}".format(**row)
+            entries = ["{:{}} ".format(full_name, name_width)]
+            for date in dates:
+                entries.append(padded_code_by_response[row[date]])
+            entries.append("{comments}".format(**row))
+            output_line = "".join(entries)
+            print(output_line,file=report_stream)
@@ -36,67 +36,17 @@ University of Notre Dame
 
 """
 
-import yaml
-
-import spreadsheet
+import configuration
+import ta_report
 
 ################################################################
 # main program
 ################################################################
 
-# Google spreadsheet column headers (21a):
-#
-#   "Timestamp"
-#   "Username"
-#   "Course number (PHYS XXXXX)"
-#   "Course name"
-#   "Last name"
-#   "First name"
-#   "Role"
-#   "Special identifications (optional)"
-#   "Comments (to be shared with TA)"
-
 if (__name__=="__main__"):
 
     # read configuration
-    with open("extract-ta.yml", "r") as f:
-        config = yaml.safe_load(f)
-    response_filename = config["response_filename_faculty_feedback"]
-    term = config["term"]
-    report_filename = "ta-faculty-feedback-{}.txt".format(term)
-    print("{} -> {}".format(response_filename,report_filename))
-
-    # read responses
-    field_names = [
-        "timestamp","username",
-        "number","name",
-        "last","first",
-        "role","special",
-        "comments"
-    ]
-    table = spreadsheet.read_spreadsheet_dictionary(
-        response_filename,
-        field_names,
-        skip=True
-    )
-
-    # filter out test submissions
-    table = list(filter((lambda row : row["last"]!="TEST"),table))
-
-    # sort by (lastname, firstname, timestamp)
-    table.sort(key=(lambda row : (row["last"].upper(),row["first"].upper(),row["number"],row["timestamp"])))
+    config = configuration.read_config("extract-ta.yml")
 
     # generate report
-    report_stream = open(report_filename,"w")
-    for row in table:
-        ## print(row)
-        short_special = row["special"].split(",")[0]
-        short_evaluator = row["username"].split("@")[0]
-        print("{last}, {first}\n"
-              "Course: PHYS {number} / {name} / {username}\n"
-              "Role: {role}\n"
-              "Special: {short_special}\n"
-              "Comments: {comments}\n"
-              "".format(short_evaluator=short_evaluator,short_special=short_special,**row),
-              file=report_stream
-        )
+    ta_report.run_faculty_feedback(config)
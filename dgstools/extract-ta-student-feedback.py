@@ -38,97 +38,17 @@ University of Notre Dame
 
 """
 
-import yaml
-
-import spreadsheet
+import configuration
+import ta_report
 
 ################################################################
 # main program
 ################################################################
 
-# Google spreadsheet column headers (21b...):
-#    
-#    "Timestamp"
-#    "Username"
-#    "Last name"
-#    "First name"
-#    "Course name"
-#    "Course number (PHYS XXXXX)"
-#    "Lab preparation and setup"
-#    "Lab contact hours"
-#    "Lab report grading"
-#    "Tutorial preparation"
-#    "Tutorial contact hours"
-#    "Tutorial exercise grading"
-#    "Homework grading from provided solutions"
-#    "Written/essay homework grading"
-#    "Exam grading from provided solutions"
-#    "Assisting in proctoring exams (under supervision of instructor)"
-#    "Office hours or help sessions"
-#    "Homework grading without solutions (and/or preparing homework solutions)"
-#    "Exam grading without solutions (and/or preparing exam solutions)"
-#    "Proctoring exams without supervision of instructor"
-#    "Attending lectures"
-#    "Other"
-#    "Please share any feedback you may have on the TA responsibilities and the TA assignment process."
-
 if (__name__=="__main__"):
 
     # read configuration
-    with open("extract-ta.yml", "r") as f:
-        config = yaml.safe_load(f)
-    response_filename = config["response_filename_student_feedback"]
-    term = config["term"]
-    report_filename = "ta-student-feedback-{}.txt".format(term)
-    print("{} -> {}".format(response_filename,report_filename))
-
-    # read responses
-    field_names = [
-            "timestamp","username",
-            "last","first",
-            "name","number",
-            "Lab-prep","Lab-contact","Lab-grading",
-            "Tut-prep","Tut-contact","Tut-grading",
-            "HW-grading","Written-grading","Exam-grading","Proctoring","Office-help",
-            "HW-grading-NS","Exam-grading-NS","Proctoring-NS","Attending","Other",
-            "comments"
-        ]
-    tagged_line_field_names = [
-            "Lab-prep","Lab-contact","Lab-grading",
-            "Tut-prep","Tut-contact","Tut-grading",
-            "HW-grading","Written-grading","Exam-grading","Proctoring","Office-help",
-            "HW-grading-NS","Exam-grading-NS","Proctoring-NS","Attending","Other",
-    ]
-    table = spreadsheet.read_spreadsheet_dictionary(
-        response_filename,
-        field_names,
-        skip=True
-    )
-
-    # filter out test submissions
-    table = list(filter((lambda row : row["last"]!="TEST"),table))
-
-    # sort by (lastname, firstname, timestamp)
-    table.sort(key=(lambda row : (row["last"].upper(),row["first"].upper(),row["timestamp"])))
-
-    # process tagged lines buttons
-    for row in table:
-        print("Before: ",row)
-        spreadsheet.convert_fields_to_tagged_lines(
-            row,tagged_line_field_names,prune=True
-        )
-        print("After: ",row)
+    config = configuration.read_config("extract-ta.yml")
 
     # generate report
-    report_stream = open(report_filename,"w")
-    for row in table:
-        print("{last}, {first}\n"
-              "Course: {number}\n"
-              "{Lab-prep}{Lab-contact}{Lab-grading}"
-              "{Tut-prep}{Tut-contact}{Tut-grading}"
-              "{HW-grading}{Written-grading}{Exam-grading}{Proctoring}{Office-help}"
-              "{HW-grading-NS}{Exam-grading-NS}{Proctoring-NS}{Attending}{Other}"
-              "Comments: {comments}\n"
-              "".format(**row),
-              file=report_stream
-        )
+    ta_report.run_student_feedback(config)
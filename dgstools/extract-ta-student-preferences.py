@@ -39,85 +39,17 @@ University of Notre Dame
 
 """
 
-import yaml
-
-import spreadsheet
+import configuration
+import ta_report
 
 ################################################################
 # main program
 ################################################################
 
-# Google spreadsheet column headers (19a):
-#
-#   "Timestamp"
-#   "Username"
-#   "Last name"
-#   "First Name"
-#   "My preferred type(s) of TA assignments are:"
-#   "Class conflicts"
-#   "Seminar conflicts"
-#   "Additional considerations"
-#   "Is there a professor with whom you would have difficulty working?"
-
-
 if (__name__=="__main__"):
 
     # read configuration
-    with open("extract-ta.yml", "r") as f:
-        config = yaml.safe_load(f)
-    response_filename = config["response_filename_student_preferences"]
-    term = config["term"]
-    report_filename = "ta-student-preferences-{}.txt".format(term)
-    print("{} -> {}".format(response_filename,report_filename))
-
-
-    field_names = [
-        "timestamp","username",
-        "last","first",
-        "preferred",
-        "class-conflict",
-        "sem-conflict",
-        "other",
-        "exclude"
-        ]
-    checkbox_newline_field_names = [
-        "preferred",
-        "class-conflict",
-        "sem-conflict",
-    ]
-
-    # read responses
-    table = spreadsheet.read_spreadsheet_dictionary(
-        response_filename,
-        field_names,
-        skip=True
-    )
-
-    # filter out test submissions
-    table = list(filter((lambda row : row["last"] not in ["TEST"]),table))
-
-    # sort by (lastname, firstname)
-    table.sort(key=(lambda row : (row["last"].upper(),row["first"].upper())))
-
-    # process tagged lines
-    for row in table:
-        spreadsheet.split_checkbox_responses(
-            row,checkbox_newline_field_names
-        )
+    config = configuration.read_config("extract-ta.yml")
 
-    # generate report tabulation
-    report_stream = open(report_filename,"w")
-    for row in table:
-        ## print(row)
-        print("{last}, {first}\n"
-              "Preferred types:\n"
-              "{preferred}"
-              "Conflicts:\n"
-              "{class-conflict}"
-              "{sem-conflict}"
-              "Other: {other}\n"
-              "Exclude: {exclude}\n"
-              "".format(**row),
-              file=report_stream
-        )
-        #print("{1} {0} <{3}>,".format(*row))
+    # generate report
+    ta_report.run_student_preferences(config)
@@ -0,0 +1,99 @@
+"""
+extract-ta.py
+
+Extract all TA preference and feedback form responses, running the
+individual reports concurrently.
+
+Usage:
+
+    python3 ~/code/dgstools/dgstools/extract-ta.py [report ...]
+
+If no report names are given, all reports are generated for which a response
+spreadsheet is given in the config file (since preference and feedback forms
+are collected at different points in the term).  Available reports:
+
+    faculty-feedback (as for extract-ta-faculty-feedback.py)
+    faculty-preferences (as for extract-ta-faculty-preferences.py)
+    student-feedback (as for extract-ta-student-feedback.py)
+    student-preferences (as for extract-ta-student-preferences.py)
+
+The config file "extract-ta.yml" is read once and shared by all reports.  It
+is a YAML file with the following keys (response filename keys may be omitted
+for forms not yet collected):
+
+    term (str): term as <yyx> ("a"=spring, "b"=fall)
+    response_filename_faculty_preferences (str): path to form response spreadsheet (CSV)
+    response_filename_faculty_feedback (str): path to form response spreadsheet (CSV)
+    response_filename_student_preferences (str): path to form response spreadsheet (CSV)
+    response_filename_student_feedback (str): path to form response spreadsheet (CSV)
+
+Requires: PyYAML
+
+Language: Python 3
+
+"""
+
+import concurrent.futures
+import sys
+
+import configuration
+import ta_report
+
+################################################################
+# report selection
+################################################################
+
+def response_filename_key(report_name):
+    """ Generate config key for response spreadsheet of report.
+
+        e.g., "faculty-feedback" -> "response_filename_faculty_feedback"
+
+    Arguments:
+
+        report_name (str): report name
+
+    Returns:
+
+        (str): config key
+    """
+
+    return "response_filename_{}".format(report_name.replace("-","_"))
+
+################################################################
+# main program
+################################################################
+
+if (__name__=="__main__"):
+
+    # read configuration
+    config = configuration.read_config("extract-ta.yml")
+
+    # select reports
+    #
+    # Duplicate names are dropped, since they would otherwise start two
+    # processes writing the same output file.
+    report_names = list(dict.fromkeys(sys.argv[1:]))
+    if (len(report_names)==0):
+        report_names = [
+            report_name
+            for report_name in ta_report.run_function_by_report
+            if (config.get(response_filename_key(report_name)) is not None)
+        ]
+    for report_name in report_names:
+        if (report_name not in ta_report.run_function_by_report):
+            raise ValueError("unrecognized report name {}".format(report_name))
+    if (len(report_names)==0):
+        print("No response spreadsheets given in config file")
+        sys.exit()
+
+    # generate reports
+    #
+    # Each report reads its own response spreadsheet and writes its own
+    # output file, so the reports are run in separate worker processes.
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(report_names)) as executor:
+        futures = [
+            executor.submit(ta_report.run_function_by_report[report_name],config)
+            for report_name in report_names
+        ]
+        for future in futures:
+            future.result()
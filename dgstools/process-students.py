@@ -51,11 +51,14 @@ University of Notre Dame
 
 """
 
+import collections
 import datetime
+import functools
+import operator
 import os
+import sys
 
-import yaml
-
+import configuration
 import spreadsheet
 
 ################################################################
@@ -126,6 +129,9 @@ field_names = [
     "experimental_proficiency",
 ]
 
+# fields giving research committee members (in database and committee supplement)
+committee_field_names = ["chair","committee1","committee2","committee3"]
+
 ################################################################
 # funding codes
 ################################################################
@@ -154,25 +160,31 @@ TEACHING_STATUS_BY_FUNDING_CODE = {
     "RA/Fellow-ext": False,
 }
 
+# TA status flag ("*" for TA, else "") by funding code, as used by get_ta_status_flag
+TA_STATUS_FLAG_BY_FUNDING_CODE = {
+    code: ("*" if teaching else "")
+    for (code,teaching) in TEACHING_STATUS_BY_FUNDING_CODE.items()
+}
+
 ################################################################
 # area formatting utility
 ################################################################
 
+AREA_NAME_BY_AREA = {
+    "As" : "Astrophysics",
+    "BP" : "Biophysics",
+    "CM" : "Condensed matter",
+    "HE" : "High energy",
+    "NS" : "Network science",
+    "NUC" : "Nuclear",
+    "" : None
+}
+
 def area_description(area,theory_expt):
     """ Generate plain-language name of research area from database codes.
     """
     
-    area_name_by_area = {
-        "As" : "Astrophysics",
-        "BP" : "Biophysics",
-        "CM" : "Condensed matter",
-        "HE" : "High energy",
-        "NS" : "Network science",
-        "NUC" : "Nuclear",
-        "" : None
-    }
-
-    area_name = area_name_by_area[area]
+    area_name = AREA_NAME_BY_AREA[area]
     if (area=="As" and theory_expt=="Experimental"):
         qualifier = "observation"
     elif (theory_expt=="Experimental"):
@@ -188,7 +200,8 @@ def area_description(area,theory_expt):
 # name processing
 ################################################################
 
-def regularize_name(name,salutation_set={"Prof."}):
+@functools.lru_cache(maxsize=None)
+def regularize_name(name,salutation_set=frozenset({"Prof."})):
     """ Regularize professor name into last-name-first form.
 
     Processes name in form:
@@ -199,9 +212,13 @@ def regularize_name(name,salutation_set={"Prof."}):
 
     Special (i.e., one-word) names are left untouched.
 
+    Results are cached, since the same few faculty names recur throughout the
+    database, and interned, so that the faculty list, advisor, and committee
+    entries all share the same string objects for a given faculty member.
+
     Arguments:
         name (string) : the name
-        salutation_set (set of string, optional) : salutations to strip
+        salutation_set (frozenset of string, optional) : salutations to strip
 
     Returns:
         (string) : the regularized name
@@ -224,7 +241,7 @@ def regularize_name(name,salutation_set={"Prof."}):
 
     ## print(name,tokens,regularized_name)
 
-    return regularized_name
+    return sys.intern(regularized_name)
 
 ################################################################
 # status helper functions
@@ -244,23 +261,12 @@ def get_ta_status_flag(funding_status):
 
     """
 
-    if (len(funding_status.split())==0):
-        base_status = ""
-    else:
-        base_status = funding_status.split()[0]
+    tokens = funding_status.split()
+    base_status = tokens[0] if (len(tokens)>0) else ""
 
-    base_status_components = base_status.split("/")
-    
-    if base_status in TEACHING_STATUS_BY_FUNDING_CODE:
-        if TEACHING_STATUS_BY_FUNDING_CODE[base_status]:
-            # TA
-            flag="*"
-        else:
-            # RA or unfunded or otherwise no teaching duty
-            flag=""
-    else:
-        # fallthrough
-        flag="?"
+    # "*" for TA, "" for RA or unfunded or otherwise no teaching duty, or
+    # fallthrough "?" for unrecognized code
+    flag = TA_STATUS_FLAG_BY_FUNDING_CODE.get(base_status,"?")
 
     return flag
 
@@ -301,37 +307,48 @@ def supplement_flag_str(name,entry):
     value = "#" if (name in entry.get("supplement_committee",set())) else ""
     return value
 
-def tenure_flag_str(name,faculty_list):
+def tenure_flag_str(name,faculty_set):
     """ Generate flag for newly-assigned committee member.
 
     Arguments:
        name (str): Faculty name
-       faculty_list (list of str): T&TT faculty list entry
+       faculty_set (frozenset of str): T&TT faculty names
 
     Returns:
         (str): flag string
     """
 
-    return "@" if (name in faculty_list) else ""
+    return "@" if (name in faculty_set) else ""
+
+################################################################
+# exceptions
+################################################################
+
+class TooManyChairsError(ValueError):
+    """ Committee supplement assigns a chair to a student who already has one."""
+    pass
 
 ################################################################
 # data input
 ################################################################
 
 def read_faculty(filename):
-    """ Read list of regularized faculty names.
+    """ Read set of regularized faculty names.
+
+    The names are returned as a set, since they are used for membership tests
+    (and as the base set for the advising tallies, which are sorted before
+    output).
 
     Arguments:
         filename (str) : filename for input stream
 
     Returns:
-        (list of str) : faculty names
+        (frozenset of str) : faculty names
     """
 
-    faculty_stream = open(filename,"r")
-    faculty_list = list(faculty_stream)
-    faculty_list = list(map(regularize_name,faculty_list))
-    return faculty_list
+    with open(filename,"r") as faculty_stream:
+        faculty_set = frozenset(map(regularize_name,faculty_stream))
+    return faculty_set
 
 ################################################################
 # database generation and postprocessing
@@ -346,7 +363,9 @@ def generate_database(funding_keys, verbose=False):
 
     Returns:
 
-        (list of dict) : list of student records
+        (tuple) : (database,database_entry_by_student)
+            list of student records, and mapping from student key
+            ("Last:First") to student record
     """
 
     # read file
@@ -356,27 +375,33 @@ def generate_database(funding_keys, verbose=False):
     )
 
     # postprocess
+    database_entry_by_student = {}
+    invalid_year_keys = []
     for entry in database:
 
         if verbose:
             print(entry)
             
         # define Last:First key
-        entry["key"] = "{last}:{first}".format(**entry)
+        entry["key"] = f"{entry['last']}:{entry['first']}"
+        if (entry["key"] in database_entry_by_student):
+            print("WARN: duplicate student key {key}".format(**entry))
+        database_entry_by_student[entry["key"]] = entry
 
         # clean up casing
         entry["netid"] = entry["netid"].lower()
 
         # extract advisor and coadvisor
         advisor_composite=entry["advisor_composite"].strip()
-        advisor_split_slash = list(map(str.strip,advisor_composite.split("/")))
-        advisor_split_and = list(map(str.strip,advisor_composite.split(" and ")))  # require spaces around "and", else splits on "Randal"!
-        if (len(advisor_split_slash)==2):
+        #
+        # The delimiter is identified before splitting, so that at most one
+        # split is done (and none for the usual case of a single advisor).
+        if (advisor_composite.count("/")==1):
             # coadvisors, separated by a slash
-            advisor_list = advisor_split_slash
-        elif (len(advisor_split_and)==2):
+            advisor_list = [token.strip() for token in advisor_composite.split("/")]
+        elif (advisor_composite.count(" and ")==1):  # require spaces around "and", else splits on "Randal"!
             # coadvisors, separated by "and" (legacy)
-            advisor_list = advisor_split_and
+            advisor_list = [token.strip() for token in advisor_composite.split(" and ")]
         elif len(advisor_composite)>0 and advisor_composite != "DGS":
             # no coadvisors, but nonnull string, means just a single advisor
             # (also skip students marked with legacy code "DGS" for student with
@@ -385,7 +410,7 @@ def generate_database(funding_keys, verbose=False):
         else:
             # no advisor at all
             advisor_list = []
-        advisor_list = list(map(regularize_name,advisor_list))  # regularize names
+        advisor_list = [regularize_name(name) for name in advisor_list]  # regularize names
         if len(advisor_list)>=1:
             entry["advisor"] = advisor_list[0]
         else:
@@ -405,34 +430,38 @@ def generate_database(funding_keys, verbose=False):
             short_advisor_composite = entry["short_advisor"]
         entry["short_advisor_composite"] = short_advisor_composite
 
+        # uppercased names for case-insensitive sorting in reports
+        entry["sort_last"] = entry["last"].upper()
+        entry["sort_first"] = entry["first"].upper()
+        entry["sort_advisor"] = entry["advisor"].upper()
+
         # reformat student
         short_student_width = 23
-        entry["short_student"] = spreadsheet.truncate_string("{last}, {first}".format(**entry),short_student_width)
+        entry["short_student"] = spreadsheet.truncate_string(f"{entry['last']}, {entry['first']}",short_student_width)
         if (entry["program"]==""):
-            entry["student_year_string"] = "{short_student} ({year})".format(**entry)
+            entry["student_year_string"] = f"{entry['short_student']} ({entry['year']})"
         else:
             # special program shows in place of year
-            entry["student_year_string"] = "{short_student} ({program})".format(**entry)
-        entry["student_email_string"] = "{first} {last} <{netid}@nd.edu>".format(**entry)
-
-        # process committee
-        committee = set()
-        if (entry["chair"] != ""):
-            committee.add(entry["chair"])
-        if (entry["committee1"] != ""):
-            committee.add(entry["committee1"])
-        if (entry["committee2"] != ""):
-            committee.add(entry["committee2"])
-        if (entry["committee3"] != ""):
-            committee.add(entry["committee3"])
-        committee = set(map(regularize_name,committee))  # regularize names
+            entry["student_year_string"] = f"{entry['short_student']} ({entry['program']})"
+        entry["student_email_string"] = f"{entry['first']} {entry['last']} <{entry['netid']}@nd.edu>"
+
+        # process committee (with regularized names)
+        committee = {
+            regularize_name(entry[field])
+            for field in committee_field_names
+            if (entry[field] != "")
+        }
         entry["committee"] = committee  # store committee
 
-        # basic status sanity checks
+        # parse year (with sanity check)
+        #
+        # The numerical year is used for sorting and selection in the reports,
+        # so an unparseable year is fatal (once all warnings have been issued).
         try:
-            float(entry["year"])
-        except:
+            entry["year_number"] = float(entry["year"])
+        except ValueError:
             print("WARN: invalid field value for year for {last}, {first} ({year})".format(**entry))
+            invalid_year_keys.append(entry["key"])
             
         # candidacy status sanity checks
         if (entry["candidacy_invited"] not in {"No","Yes"}):
@@ -464,24 +493,23 @@ def generate_database(funding_keys, verbose=False):
             
         entry["candidacy_status"] = status
 
-    return database
+    if (len(invalid_year_keys)>0):
+        raise ValueError("Invalid year for student(s) {}".format(", ".join(invalid_year_keys)))
 
-def augment_committees(database,supplement_filename):
+    return (database,database_entry_by_student)
+
+def augment_committees(database_entry_by_student,supplement_filename):
     """ Read CSV database and postprocess fields.
 
     Format:
         last, first, committee1, committee2, committee3, chair
 
     Arguments:
-        database (list of dict): list of student records
+        database_entry_by_student (dict of dict): mapping from student key
+            to student record (as returned by generate_database)
         supplement_filename (str): filename for input stream
     """
 
-    # provide mapping into current database
-    database_entry_by_student = {}
-    for entry in database:
-        database_entry_by_student[entry["key"]] = entry
-
     # read committee additions file
     supplement_field_names = [
         "last",
@@ -508,24 +536,15 @@ def augment_committees(database,supplement_filename):
         
         # process committee supplements
         ## print(supplement_entry)
-        supplement_committee = set()
+        supplement_committee = {
+            regularize_name(supplement_entry[field])
+            for field in committee_field_names
+            if (supplement_entry[field] != "")
+        }
         if (supplement_entry["chair"] != ""):
-            supplement_committee.add(supplement_entry["chair"])
             if (entry["chair"] != ""):
-                class IonescuError(Exception):
-                    def __init__(self, value):
-                        self.value = value
-                    def __str__(self):
-                        return repr(self.value)
-                raise IonescuError("too many chairs")
+                raise TooManyChairsError("too many chairs for {}".format(key))
             entry["chair"] = supplement_entry["chair"]
-        if (supplement_entry["committee1"] != ""):
-            supplement_committee.add(supplement_entry["committee1"])
-        if (supplement_entry["committee2"] != ""):
-            supplement_committee.add(supplement_entry["committee2"])
-        if (supplement_entry["committee3"] != ""):
-            supplement_committee.add(supplement_entry["committee3"])
-        supplement_committee = set(map(regularize_name,supplement_committee))  # regularize names
 
         # save results
         entry["supplement_committee"] = supplement_committee
@@ -581,104 +600,211 @@ def report_student_status(filename,database,sorting="year",options={},start_year
 
     """
 
-    report_stream = open(filename,"w")
+    report_lines = []
 
     # header
-    print(
+    report_lines.append(
         "Notre Dame physics graduate students\n"
         "{}\n"
         "\n"
         "{}"
         "\n"
-        "".format(DATE_STRING,student_status_legend),
-        file=report_stream
+        "".format(DATE_STRING,student_status_legend)
     )
 
     ## if (sorting=="group-advisor"):
     ##     # may not want to count first-years against group
-    ##     print(
+    ##     report_lines.append(
     ##         "  Report by group and advisor\n"
-    ##         "  Includes students starting from year {}".format(start_year),
-    ##         file=report_stream
+    ##         "  Includes students starting from year {}".format(start_year)
     ##     )
 
     # generate lines for entries
-    tagged_lines = dict()
-    tagged_entries = dict()
+    #
+    # Lines are accumulated as (key, entry, line) tuples.  The entry is kept
+    # with its line since it is needed for control-break processing.
+    tagged_lines = []
     last_group = (None,None)
     last_advisor = None
+    line_template = (
+        "{student_year_string:28s} {candidacy_status} {short_advisor_composite:20} "
+        + ("{area:3} {theory_expt_code:1} " if ("area" in options) else "")
+        + ("  {ta_status_flag_fall:1} {funding_fall:20} {ta_status_flag_spring:1} {funding_spring:20}" if ("funding" in options) else "")
+        + ("{meeting_date_prior_year_2:10} " if ("meeting" in options) else "")
+        + ("{meeting_date_prior_year:10} " if ("meeting" in options) else "")
+        + ("{meeting_date:10} " if ("meeting" in options) else "")
+        + ("{student_email_string}"  if ("e-mail" in options) else "")
+    )
+    format_line = line_template.format  # bound once, outside the loop
+    ta_status_flag_for = get_ta_status_flag  # local name, for fast lookup in loop
+    sort_by_year = (sorting=="year")
+    sort_by_group_advisor = (sorting=="group-advisor")
     for entry in database:
 
         # cut out special students
-        ## if (float(entry["year"])==0):
+        ## if (entry["year_number"]==0):
         ##     continue
 
-        if (float(entry["year"])<start_year):
+        if (entry["year_number"]<start_year):
             continue
 
         # ordering by: decreasing seniority, then alpha
-        if (sorting=="year"):
-            key = (-float(entry["year"]),entry["last"].upper(),entry["first"].upper())
-        elif (sorting=="group-advisor"):
+        if (sort_by_year):
+            key = (-entry["year_number"],entry["sort_last"],entry["sort_first"])
+        elif (sort_by_group_advisor):
             area_for_sorting = entry["area"] if (entry["area"]!="") else "ZZZ"  # push unafilliated students to end
-            key = (area_for_sorting,entry["theory_expt"],entry["advisor"].upper(),
-                   -float(entry["year"]),entry["last"].upper(),entry["first"].upper())
+            key = (area_for_sorting,entry["theory_expt"],entry["sort_advisor"],
+                   -entry["year_number"],entry["sort_last"],entry["sort_first"])
 
         # generate line for entry
         theory_expt_code = entry["theory_expt"][0] if len(entry["theory_expt"])>0 else "";
-        ta_status_flag_fall = get_ta_status_flag(entry["funding_fall"])
-        ta_status_flag_spring = get_ta_status_flag(entry["funding_spring"])
-        tagged_lines[key] = (
-            "{student_year_string:28s} {candidacy_status} {short_advisor_composite:20} "
-            + ("{area:3} {theory_expt_code:1} " if ("area" in options) else "")
-            + ("  {ta_status_flag_fall:1} {funding_fall:20} {ta_status_flag_spring:1} {funding_spring:20}" if ("funding" in options) else "")
-            + ("{meeting_date_prior_year_2:10} " if ("meeting" in options) else "")
-            + ("{meeting_date_prior_year:10} " if ("meeting" in options) else "")
-            + ("{meeting_date:10} " if ("meeting" in options) else "")
-            + ("{student_email_string}"  if ("e-mail" in options) else "")
-            ).format(
-                theory_expt_code=theory_expt_code,
-                ta_status_flag_fall=ta_status_flag_fall,ta_status_flag_spring=ta_status_flag_spring,
-                **entry
-                 )
-
-        # keep track of entry for key
-        #
-        # needed for control-break processing
-        tagged_entries[key] = entry
+        ta_status_flag_fall = ta_status_flag_for(entry["funding_fall"])
+        ta_status_flag_spring = ta_status_flag_for(entry["funding_spring"])
+        line = format_line(
+            theory_expt_code=theory_expt_code,
+            ta_status_flag_fall=ta_status_flag_fall,ta_status_flag_spring=ta_status_flag_spring,
+            **entry
+        )
+        tagged_lines.append((key,entry,line))
 
     # generate sorted output of lines
-    for key in sorted(tagged_lines.keys()):
+    tagged_lines.sort(key=operator.itemgetter(0))
+    for (key,entry,line) in tagged_lines:
 
         # control break processing for group-advisor
-        entry = tagged_entries[key]
         group = (entry["area"],entry["theory_expt"])
         advisor = entry["advisor"]
-        if (sorting=="group-advisor"):
+        if (sort_by_group_advisor):
             if (group!=last_group):
-                print(
+                report_lines.append(
                     "\n"
                     "----------------------------------------------------------------\n"
                     "{}\n"
                     "----------------------------------------------------------------\n"
-                    "".format(area_description(entry["area"],entry["theory_expt"])),
-                    file=report_stream
+                    "".format(area_description(entry["area"],entry["theory_expt"]))
                 )
             elif (advisor!=last_advisor):
-                print("",file=report_stream)
+                report_lines.append("")
         
         last_advisor = advisor
         last_group = group
         
-        # print line
-        print(tagged_lines[key],file=report_stream)
+        # add line
+        report_lines.append(line)
 
-    report_stream.close()
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("\n".join(report_lines)+"\n")
 
 ################################################################
 # student status -- for TA assignment process
 ################################################################
 
+def ta_hours(entry,funding_status):
+    """Determine TA hours by heuristic.
+
+    Arguments:
+        entry (dict): student entry
+        funding_status (str): funding entry for current term
+
+    Returns:
+        (str) : hours ("0" for nonteaching role, or "???" if to be
+            determined manually)
+    """
+
+    tokens = funding_status.split()
+    base_status = tokens[0] if (len(tokens)>0) else ""
+    status_annotation = tokens[1] if (len(tokens)>1) else ""
+    if (base_status in TEACHING_STATUS_BY_FUNDING_CODE and not TEACHING_STATUS_BY_FUNDING_CODE[base_status]):
+        # nonteaching role
+        hours="0"
+    elif (base_status=="TA"):
+        if (status_annotation in ["(Schmitt)", "(Notebaert)"] and entry["year_number"]<=2):
+            # fellowship TA with reduced hours
+            hours="9"
+        else:
+            hours="15"
+    else:
+        # fallthrough (includes "TA/RA", with hours to be determined manually)
+        hours="???"
+
+    return hours
+
+def ta_line_list(entry,funding_field):
+    """Generate line of TA list for distribution to students.
+
+    Arguments:
+        entry (dict): student entry
+        funding_field (str): database field name for funding status
+            for current term
+
+    Returns:
+        (str) : line
+    """
+
+    ta_status_flag = get_ta_status_flag(entry[funding_field])
+    return (
+        "{ta_status_flag:1s} {last}, {first}"
+        "".format(ta_status_flag=ta_status_flag,**entry)
+    )
+
+def ta_line_notes(entry,funding_field):
+    """Generate line of working form for noting TA preferences.
+
+    Arguments:
+        entry (dict): student entry
+        funding_field (str): database field name for funding status
+            for current term
+
+    Returns:
+        (str) : line, or None if student has no TA hours
+    """
+
+    funding_status = entry[funding_field]
+    hours = ta_hours(entry,funding_status)
+    if (hours=="0"):
+        return None
+    ta_status_flag = get_ta_status_flag(funding_status)
+    theory_expt_code = entry["theory_expt"][0] if len(entry["theory_expt"])>0 else ""
+    return (
+        "{student_year_string:28s} {very_short_advisor:3s} {area:3s} {theory_expt_code:1} "
+        "{ta_status_flag:1s} {hours:>3s} "
+        "|__|__|__|__|__|__|__|__|__|_______"
+        "".format(
+            very_short_advisor=spreadsheet.truncate_string(entry["short_advisor_composite"],3),
+            theory_expt_code=theory_expt_code,ta_status_flag=ta_status_flag,hours=hours,
+            **entry
+            )
+    )
+
+def ta_line_spreadsheet(entry,funding_field):
+    """Generate line of template for TA roster spreadsheet.
+
+    Arguments:
+        entry (dict): student entry
+        funding_field (str): database field name for funding status
+            for current term
+
+    Returns:
+        (str) : line
+    """
+
+    funding_status = entry[funding_field]
+    hours = ta_hours(entry,funding_status)
+    ta_status_flag = get_ta_status_flag(funding_status)
+    return (
+        "{last},{first},{year},{netid},{short_advisor_composite},{area},"
+        "{funding_status},{hours},{ta_status_flag}"
+        "".format(funding_status=funding_status,hours=hours,ta_status_flag=ta_status_flag,**entry)
+    )
+
+# line generator for each roster type in report_student_status_for_ta_assignment
+TA_LINE_FUNCTION_BY_MODE = {
+    "list": ta_line_list,
+    "notes": ta_line_notes,
+    "spreadsheet": ta_line_spreadsheet,
+}
+
 def report_student_status_for_ta_assignment(filename,database,funding_field,mode):
     """Generate report of student status for ta roster spreadsheet.
 
@@ -699,95 +825,54 @@ def report_student_status_for_ta_assignment(filename,database,funding_field,mode
 
     """
 
-    report_stream = open(filename,"w")
+    # select line generator for roster type
+    if (mode not in TA_LINE_FUNCTION_BY_MODE):
+        raise ValueError("Unrecognized mode")
+    ta_line = TA_LINE_FUNCTION_BY_MODE[mode]
+
+    report_lines = []
 
     # header
     if (mode=="list"):
-        print(
+        report_lines.append(
             "TA list\n"
             "{}\n"
             "\n"
             "  * = TA support\n"
             "  ? = possible TA support (TBD)\n"
-            "".format(DATE_STRING),
-            file=report_stream
+            "".format(DATE_STRING)
         )
     elif (mode=="notes"):
-        print(
+        report_lines.append(
             "                                             |NS|He|Tu|Ex|Ma|La|De|Ob|Gr|Notes\n"
-            "                                             +--+--+--+--+--+--+--+--+--+-------",
-            file=report_stream
+            "                                             +--+--+--+--+--+--+--+--+--+-------"
         )
                       
     # generate lines for entries
-    tagged_lines = dict()
+    tagged_lines = []
     for entry in database:
 
         # cut out special students
-        if (float(entry["year"])==0):
+        if (entry["year_number"]==0):
             continue
 
-        # ordering by: name-year (which means by name except in extraordinary circumstances)
-        key = (entry["last"].upper(),entry["first"].upper(),float(entry["year"]))
-
-        # determine TA hours by heuristic
-        funding_status = entry[funding_field]
-        if (len(funding_status.split())==0):
-            base_status = ""
-            status_annotation = ""
-        elif (len(funding_status.split())==1):
-            base_status = funding_status.split()[0]
-            status_annotation = ""
-        else:
-            base_status = funding_status.split()[0]
-            status_annotation = funding_status.split()[1]
-        if (base_status in TEACHING_STATUS_BY_FUNDING_CODE and not TEACHING_STATUS_BY_FUNDING_CODE[base_status]):
-            # nonteaching role
-            hours="0"
-        elif (base_status=="TA"):
-                if (status_annotation in ["(Schmitt)", "(Notebaert)"] and entry["year"]<="2"):
-                    # fellowship TA with reduced hours
-                    hours="9"
-                else:
-                    hours="15"
-        else:
-            # fallthrough (includes "TA/RA", with hours to be determined manually)
-            hours="???"
-
         # generate line for entry
-        ta_status_flag=get_ta_status_flag(entry[funding_field])
-        theory_expt_code = entry["theory_expt"][0] if len(entry["theory_expt"])>0 else "";
-        if (mode=="list"):
-            tagged_lines[key] = (
-                "{ta_status_flag:1s} {last}, {first}"
-                "".format(ta_status_flag=ta_status_flag,**entry)
-            )
-        elif (mode=="notes"):
-            if (hours!="0"):
-                tagged_lines[key] = (
-                    "{student_year_string:28s} {very_short_advisor:3s} {area:3s} {theory_expt_code:1} "
-                    "{ta_status_flag:1s} {hours:>3s} "
-                    "|__|__|__|__|__|__|__|__|__|_______"
-                    "".format(
-                        very_short_advisor=spreadsheet.truncate_string(entry["short_advisor_composite"],3),
-                        theory_expt_code=theory_expt_code,ta_status_flag=ta_status_flag,hours=hours,
-                        **entry
-                        )
-                )
-        elif (mode=="spreadsheet"):
-            tagged_lines[key] = (
-                "{last},{first},{year},{netid},{short_advisor_composite},{area},"
-                "{funding_status},{hours},{ta_status_flag}"
-                "".format(funding_status=funding_status,hours=hours,ta_status_flag=ta_status_flag,**entry)
-            )
-        else:
-            raise ValueError("Unrecognized mode")
+        line = ta_line(entry,funding_field)
+        if (line is None):
+            continue
+
+        # ordering by: name-year (which means by name except in extraordinary circumstances)
+        key = (entry["sort_last"],entry["sort_first"],entry["year_number"])
+        tagged_lines.append((key,line))
 
     # generate sorted output of lines
-    for key in sorted(tagged_lines.keys()):
-        print(tagged_lines[key],file=report_stream)
+    tagged_lines.sort(key=operator.itemgetter(0))
+    for (key,line) in tagged_lines:
+        report_lines.append(line)
 
-    report_stream.close()
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("\n".join(report_lines)+"\n")
 
 ################################################################
 # student status -- as TA list for preference survey
@@ -804,44 +889,46 @@ def report_student_status_for_ta_list(filename,database,funding_field):
 
     """
 
-    report_stream = open(filename,"w")
+    report_lines = []
 
     # header
-    print(
+    report_lines.append(
         "TA list\n"
         "{}\n"
         "\n"
         "  * = TA support\n"
         "  ? = possible TA support (TBD)\n"
-        "".format(DATE_STRING),
-        file=report_stream
+        "".format(DATE_STRING)
     )
 
     # generate lines for entries
-    tagged_lines = dict()
+    tagged_lines = []
     for entry in database:
 
         # cut out special students
-        if (float(entry["year"])==0):
+        if (entry["year_number"]==0):
             continue
 
         # ordering by: name
-        key = (entry["last"],entry["first"],float(entry["year"]))
+        key = (entry["last"],entry["first"],entry["year_number"])
 
         # determine TA status
         ta_status_flag = get_ta_status_flag(entry[funding_field])
 
         # generate line for entry
-        tagged_lines[key] = (
+        tagged_lines.append((key,
             "{ta_status_flag:1s} {last}, {first}"
             "".format(ta_status_flag=ta_status_flag,**entry)
-        )
+        ))
 
     # generate sorted output of lines
-    for key in sorted(tagged_lines.keys()):
-        print(tagged_lines[key],file=report_stream)
+    tagged_lines.sort(key=operator.itemgetter(0))
+    for (key,line) in tagged_lines:
+        report_lines.append(line)
 
-    report_stream.close()
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("\n".join(report_lines)+"\n")
 
 ################################################################
 # advising
@@ -856,18 +943,14 @@ def tally_advising_assignments(database,base_set,count_defended=False):
         count_defended (bool,optional): whether or not to count defended students in current load
 
     Returns:
-        (tuple of dict) : (advisor_tally,coadvisor_tally,committee_tally)
-            mapping committee member name to assignment count
+        (dict of list of int) : mapping faculty name to assignment counts as
+            [advisor_count,coadvisor_count,committee_count]
     """
 
     # initialize tallies
-    advisor_tally = dict()
-    coadvisor_tally = dict()
-    committee_tally = dict()
+    tally = collections.defaultdict(lambda : [0,0,0])
     for member in base_set:
-        advisor_tally[member]=0
-        coadvisor_tally[member]=0
-        committee_tally[member]=0
+        tally[member]  # create zero tally
 
     for entry in database:
 
@@ -875,16 +958,16 @@ def tally_advising_assignments(database,base_set,count_defended=False):
             continue
 
         advisor = entry["advisor"]
-        advisor_tally[advisor] = advisor_tally.get(advisor,0)+1
+        tally[advisor][0] += 1
 
         coadvisor = entry["coadvisor"]
         if (coadvisor != ""):
-            coadvisor_tally[coadvisor] = coadvisor_tally.get(coadvisor,0)+1
+            tally[coadvisor][1] += 1
 
         for member in entry["committee"]:
-            committee_tally[member] = committee_tally.get(member,0)+1
+            tally[member][2] += 1
 
-    return (advisor_tally,coadvisor_tally,committee_tally)
+    return dict(tally)
 
 def collect_advising_assignments(database,base_set):
     """ Collect advising roles by faculty member.
@@ -894,28 +977,48 @@ def collect_advising_assignments(database,base_set):
         base_set (list) : base set of faculty to include, even if unassigned
 
     Returns:
-        (dict of list of dict) : mapping faculty name to list of student records
+        (dict of list of tuple) : mapping faculty name to list of (role,entry)
+            tuples, where role is "advisor", "coadvisor", or "committee", and
+            entry is the student record
     """
 
     # initialize faculty records
-    advising_assignments = dict()
+    advising_assignments = collections.defaultdict(list)
     for member in base_set:
-        advising_assignments[member]=[]
+        advising_assignments[member]  # create empty record
 
     # add entries to faculty records
     for entry in database:
 
-        full_committee = entry["committee"].copy()  # make copy rather than alias
-        if (entry["advisor"] != ""):
-            full_committee.add(entry["advisor"])
-        if (entry["coadvisor"] != ""):
-            full_committee.add(entry["coadvisor"])
-        
-        for member in full_committee:
-            advising_assignments[member] = advising_assignments.get(member,[])
-            advising_assignments[member].append(entry)
+        # file under committee members
+        #
+        # The advisor and coadvisor are then filed separately, unless already
+        # on the committee, rather than building a merged copy of the committee
+        # set for each student.
+        committee = entry["committee"]
+        advisor = entry["advisor"]
+        coadvisor = entry["coadvisor"]
+        for member in committee:
 
-    return advising_assignments
+            # assign role
+            if (advisor==member):
+                role = "advisor"
+            elif (coadvisor==member):
+                role = "coadvisor"
+            ## elif (entry["chair"]==member):
+            ##     role = "chair"
+            else:
+                role = "committee"
+
+            advising_assignments[member].append((role,entry))
+
+        # file under advisor and coadvisor
+        if ((advisor != "") and (advisor not in committee)):
+            advising_assignments[advisor].append(("advisor",entry))
+        if ((coadvisor != "") and (coadvisor not in committee) and (coadvisor != advisor)):
+            advising_assignments[coadvisor].append(("coadvisor",entry))
+
+    return dict(advising_assignments)
 
 def report_advising_load(filename,database,base_set):
     """ Generate report of advising/coadvising load.
@@ -926,38 +1029,36 @@ def report_advising_load(filename,database,base_set):
         base_set (list) : base set of faculty to include, even if unassigned
     """
 
-    report_stream = open(filename,"w")
+    report_lines = []
 
     # header
-    print(
+    report_lines.append(
         "Advising and research committee loads\n"
         "\n"
         "  {}\n"
         "\n"
         "  advisor + coadvisor / committee\n"
         "  {}"
-        "".format(DATE_STRING,faculty_legend_tenure),
-        file=report_stream
+        "".format(DATE_STRING,faculty_legend_tenure)
     )
 
-    (advisor_tally,coadvisor_tally,committee_tally) = tally_advising_assignments(database,base_set)
-    # take all faculty names, excluding "DGS"
-    sorted_names = sorted(
-        (set(advisor_tally.keys()) | set(coadvisor_tally.keys()) | set(committee_tally.keys())),
-        key=key_kicking_dgs_to_end
-    )
+    tally = tally_advising_assignments(database,base_set)
+    # take all faculty names, putting "DGS"/"TBD" at end of list
+    sorted_names = sorted(tally.keys(),key=key_kicking_dgs_to_end)
+    append_line = report_lines.append  # bound once, outside the loop
     for name in sorted_names:
-        if name in coadvisor_tally:
-            coadvisor_tally_string = "+{:1d}".format(coadvisor_tally.get(name,0))
+        (advisor_count,coadvisor_count,committee_count) = tally[name]
+        # coadvisor count is shown for base faculty or actual coadvisors
+        if ((name in base_set) or (coadvisor_count>0)):
+            coadvisor_tally_string = "+{:1d}".format(coadvisor_count)
         else:
             coadvisor_tally_string = ""
-        print(
+        append_line(
             "{:34} {:2d} {:2s} / {:<2d} {:1s}"
             "".format(
-                name,advisor_tally.get(name,0),coadvisor_tally_string,committee_tally.get(name,0),
-                tenure_flag_str(name,faculty_list)
-            ),
-            file=report_stream
+                name,advisor_count,coadvisor_tally_string,committee_count,
+                tenure_flag_str(name,faculty_set)
+            )
         )
         ## print(
         ##     "{:31} {:1d} / {:1d} / {:1d}"
@@ -966,7 +1067,16 @@ def report_advising_load(filename,database,base_set):
         ##     ),
         ##     file=report_stream
         ## )
-    report_stream.close()
+
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("\n".join(report_lines)+"\n")
+
+# line for each student entry in report_advising_faculty
+advising_faculty_line_template = (
+    "{supplement_flag_str:1s} {student_year_string:28s} [{candidacy_status}] "
+    "{short_advisor_composite:s} {advising_role_str:9s}"
+)
 
 def report_advising_faculty(filename,database,base_set,include_defended=True,include_advising=True,flag_tenured=False):
     """Generate report of advising responsibilities by faculty.
@@ -989,14 +1099,14 @@ def report_advising_faculty(filename,database,base_set,include_defended=True,inc
 
     """
 
-    report_stream = open(filename,"w")
+    report_lines = []
 
     # header
     if (include_advising):
         title = "Advising and research committees\n  by faculty member\n"
     else:
         title = "Research committees by faculty member\n  excludes defended students\n\n"
-    print(
+    report_lines.append(
         "{}"
         "{}\n"
         "\n"
@@ -1007,8 +1117,7 @@ def report_advising_faculty(filename,database,base_set,include_defended=True,inc
         "".format(
             title,DATE_STRING,student_status_legend,
             faculty_legend_tenure if flag_tenured else faculty_legend_base
-        ),
-        file=report_stream
+        )
     )
 
     # collect advising assignments
@@ -1016,68 +1125,67 @@ def report_advising_faculty(filename,database,base_set,include_defended=True,inc
 
     # sort faculty names, putting "DGS"/"TBD" at end of list
     sorted_names = sorted(advising_assignments.keys(),key=key_kicking_dgs_to_end)
+    append_line = report_lines.append  # bound once, outside the loop
+    format_entry_line = advising_faculty_line_template.format_map
     for name in sorted_names:
         
         # generate lines for entries
-        tagged_lines = dict()
-        for entry in advising_assignments[name]:
-
-            # assign role
-            if (entry["advisor"]==name):
-                role = "advisor"
-            elif (entry["coadvisor"]==name):
-                role = "coadvisor"
-            ## elif (entry["chair"]==name):
-            ##     role = "chair"
-            else:
-                role = "committee"
+        tagged_lines = []
+        for (role,entry) in advising_assignments[name]:
 
             # prune entries by selection criteria
-            if ((not include_defended) and (entry["candidacy_status"] == "D")):
+            #
+            # This is done before any formatting of the line.  The role test
+            # comes first, since the role is already in hand.
+            if ((not include_advising) and (role not in {"committee","chair"})):
                 continue
-            if ((not include_advising) and (role not in ["committee","chair"])):
+            if ((not include_defended) and (entry["candidacy_status"] == "D")):
                 continue
 
             # define ordering
 
             # ordering by: decreasing role, then decreasing seniority, then alpha
-            key = (role,-float(entry["year"]),entry["last"],entry["first"])
+            key = (role,-entry["year_number"],entry["last"],entry["first"])
 
             # ordering by: decreasing seniority, then alpha
-            ##key = (-float(entry["year"]),entry["last"],entry["first"])
+            ##key = (-entry["year_number"],entry["last"],entry["first"])
 
             # generate line for entry
             ## student_string = "{last}, {first} ({year})".format(**entry)
-            entry_string = "{supplement_flag_str:1s} {student_year_string:28s} [{candidacy_status}] {short_advisor_composite:s} {advising_role_str:9s}".format(
-                advising_role_str=advising_role_str(name,entry),
-                supplement_flag_str=supplement_flag_str(name,entry),
-                **entry
+            entry_string = format_entry_line(
+                {
+                    **entry,
+                    "advising_role_str": advising_role_str(name,entry),
+                    "supplement_flag_str": supplement_flag_str(name,entry),
+                }
             )
-            tagged_lines[key] = entry_string
+            tagged_lines.append((key,entry_string))
 
         # short circuit empty entry
         #   e.g., if include_advising->False and faculty member is only an advisor, not a committee member
-        if (len(tagged_lines.keys())==0):
+        if (len(tagged_lines)==0):
             continue
         
         # head faculty member entry
-        print(
+        append_line(
             "{:s} {}"
             "".format(
                 name,
-                tenure_flag_str(name,faculty_list) if flag_tenured else ""
-            ),
-            file=report_stream
+                tenure_flag_str(name,faculty_set) if flag_tenured else ""
+            )
         )
             
         # generate sorted output of lines
-        for key in sorted(tagged_lines.keys()):
-            print(tagged_lines[key],file=report_stream)
+        tagged_lines.sort(key=operator.itemgetter(0))
+        for (key,line) in tagged_lines:
+            append_line(line)
 
         # buffer line
-        print(file=report_stream)
+        append_line("")
 
-    report_stream.close()
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("\n".join(report_lines)+"\n")
 
 def report_advising_student(filename,database):
     """ Generate report of advising responsibilities by student.
@@ -1087,25 +1195,24 @@ def report_advising_student(filename,database):
         database (list of dict): student database
     """
 
-    report_stream = open(filename,"w")
+    report_lines = []
 
     # header
-    print(
+    report_lines.append(
         "Advising and research committees\n  by student\n"
         "\n"
         "  {}\n"
         "\n"
         "{}"
-        "".format(DATE_STRING,faculty_legend_base),
-        file=report_stream
+        "".format(DATE_STRING,faculty_legend_base)
     )
 
     # generate lines for entries
-    tagged_lines = dict()
+    tagged_lines = []
     for entry in database:
 
         # ordering by: name
-        key = (entry["last"],entry["first"],float(entry["year"]))
+        key = (entry["last"],entry["first"],entry["year_number"])
 
         # generate multiline entry
         ## student_string = "{last}, {first} ({year})".format(**entry)
@@ -1116,13 +1223,12 @@ def report_advising_student(filename,database):
         ##     candidacy_status_censored = " "
         entry_lines = []
         entry_lines.append("{student_year_string:28s}".format(**entry))
-        ordered_full_committee_name_list = []
-        if (entry["advisor"]!=""):
-            ordered_full_committee_name_list.append(entry["advisor"])
-        if (entry["coadvisor"]!=""):
-            ordered_full_committee_name_list.append(entry["coadvisor"])
-        for name in sorted(entry["committee"]):
-            ordered_full_committee_name_list.append(name)
+        ordered_full_committee_name_list = [
+            name
+            for name in (entry["advisor"],entry["coadvisor"])
+            if (name!="")
+        ]
+        ordered_full_committee_name_list += sorted(entry["committee"])
         for name in ordered_full_committee_name_list:
             entry_lines.append(
                 "{supplement_flag_str:1s} {name} {advising_role_str:s}".format(
@@ -1133,14 +1239,17 @@ def report_advising_student(filename,database):
                 )
             )
 
-        tagged_lines[key] = "\n".join(entry_lines)
+        tagged_lines.append((key,"\n".join(entry_lines)))
 
     # generate sorted output of lines
-    for key in sorted(tagged_lines.keys()):
-        print(tagged_lines[key],file=report_stream)
-        print(file=report_stream)
+    tagged_lines.sort(key=operator.itemgetter(0))
+    for (key,line) in tagged_lines:
+        report_lines.append(line)
+        report_lines.append("")
 
-    report_stream.close()
+    # write report
+    with open(filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("\n".join(report_lines)+"\n")
 
 ################################################################
 # main program
@@ -1149,13 +1258,11 @@ def report_advising_student(filename,database):
 if (__name__=="__main__"):
 
     # read configuration
-    with open("process-students.yml", "r") as f:
-        config = yaml.safe_load(f)
+    config = configuration.read_config("process-students.yml")
 
     # set date
     date_string = config.get("date")
-    month, day, year = tuple(map(int,date_string.split("/")))
-    today = datetime.date(year, month, day)
+    today = datetime.datetime.strptime(date_string, "%m/%d/%Y").date()
     DATE_STRING = today.strftime("%m/%d/%Y")  # ugly global...
     date_code = today.strftime("%y%m%d")
         
@@ -1163,11 +1270,11 @@ if (__name__=="__main__"):
     database_filename = config.get("database_filename")
     faculty_filename = config.get("faculty_filename")
     research_committee_filename = config.get("research_committee_filename")
-    database = generate_database(funding_keys=("funding_fall","funding_spring"), verbose=False)
-    faculty_list = read_faculty(faculty_filename)
+    (database,database_entry_by_student) = generate_database(funding_keys=("funding_fall","funding_spring"), verbose=False)
+    faculty_set = read_faculty(faculty_filename)
     if os.path.exists(research_committee_filename):
         # for preliminary committee assignments
-        augment_committees(database,"committee-supplement.csv")
+        augment_committees(database_entry_by_student,"committee-supplement.csv")
 
     # student status reports
     report_student_status("student-status-contact-{}.txt".format(date_code),database,options={"area","e-mail"})
@@ -1189,14 +1296,14 @@ if (__name__=="__main__"):
     report_student_status("student-status-meeting-{}.txt".format(date_code),database,options={"area","meeting"})
 
     # advising reports
-    report_advising_faculty("advising-by-faculty-{}.txt".format(date_code),database,faculty_list,include_defended=True,include_advising=True,flag_tenured=False)
+    report_advising_faculty("advising-by-faculty-{}.txt".format(date_code),database,faculty_set,include_defended=True,include_advising=True,flag_tenured=False)
     report_advising_student("advising-by-student-{}.txt".format(date_code),database)
-    report_advising_load("advising-load-{}.txt".format(date_code),database,faculty_list)
+    report_advising_load("advising-load-{}.txt".format(date_code),database,faculty_set)
 
     # working reports for mentoring committee assignment process (optional)
     make_committee_preparation_reports = config.get("research_committee") is not False
     if (make_committee_preparation_reports):
-        report_advising_faculty("research-committees-by-faculty-{}.txt".format(date_code),database,faculty_list,include_defended=False,include_advising=False,flag_tenured=True)
+        report_advising_faculty("research-committees-by-faculty-{}.txt".format(date_code),database,faculty_set,include_defended=False,include_advising=False,flag_tenured=True)
  
     # working reports for TA assignment process (optional)
     make_ta_assignment_reports = config.get("ta") is not False
@@ -33,6 +33,7 @@ University of Notre Dame
 """
 
 import datetime
+import operator
 import re
 import sys
 
@@ -406,7 +407,7 @@ def collect_slots_by_course(slots_table,course_list):
 
     # sort assignments by (course,section)
     for course in course_list:
-        slots_by_course[course].sort(key=(lambda slot : (slot["course"],slot["section"])))
+        slots_by_course[course].sort(key=operator.itemgetter("course","section"))
 
     return slots_by_course
 
@@ -444,7 +445,7 @@ def collect_slots_by_ta(slots_table,ta_keys,key_dict,ta_info_by_ta):
     # sort assignments by (course,section)
     for ta in ta_keys:
         ## print("sorting",ta,len(slots_by_ta[ta]))
-        slots_by_ta[ta].sort(key=(lambda slot : (slot["course"],slot["section"])))
+        slots_by_ta[ta].sort(key=operator.itemgetter("course","section"))
 
     return slots_by_ta
 
@@ -690,27 +691,23 @@ def prepare_reports(ta_keys, key_dict, ta_info_by_ta, course_list, hours_by_ta,
     
     # report by course
     report_filename = "assignments{}-course.txt".format(REPORT_VERSION_INFO["flag"])
-    report_stream = open(report_filename,"w")
-    report_slots_by_course(report_stream,ta_info_by_ta,course_list,key_dict,hours_by_ta,slots_by_course)
-    report_stream.close()
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_slots_by_course(report_stream,ta_info_by_ta,course_list,key_dict,hours_by_ta,slots_by_course)
 
     # report by ta
     report_filename = "assignments{}-ta.txt".format(REPORT_VERSION_INFO["flag"])
-    report_stream = open(report_filename,"w")
-    report_slots_by_ta(report_stream,ta_info_by_ta,ta_keys,hours_by_ta,slots_by_ta,mode="slots")
-    report_stream.close()
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_slots_by_ta(report_stream,ta_info_by_ta,ta_keys,hours_by_ta,slots_by_ta,mode="slots")
 
     # report by ta -- with netid
     report_filename = "assignments{}-ta-netid.txt".format(REPORT_VERSION_INFO["flag"])
-    report_stream = open(report_filename,"w")
-    report_slots_by_course(report_stream,ta_info_by_ta,course_list,key_dict,hours_by_ta,slots_by_course,show_netid=True)
-    report_stream.close()
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_slots_by_course(report_stream,ta_info_by_ta,course_list,key_dict,hours_by_ta,slots_by_course,show_netid=True)
 
     # report hours
     report_filename = "assignments{}-hours.txt".format(REPORT_VERSION_INFO["flag"])
-    report_stream = open(report_filename,"w")
-    report_slots_by_ta(report_stream,ta_info_by_ta,ta_keys,hours_by_ta,slots_by_ta,mode="quota")
-    report_stream.close()
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_slots_by_ta(report_stream,ta_info_by_ta,ta_keys,hours_by_ta,slots_by_ta,mode="quota")
             
 ################################################################
 # main program
@@ -39,6 +39,7 @@ University of Notre Dame
 
 import csv
 import io
+import sys
 # import unicodedata
 import unidecode
 import itertools
@@ -114,7 +115,10 @@ def read_spreadsheet_clean_stream(filename,skip=False,debug=False):
     """
 
     # import raw text
-    with open(filename,newline="",encoding="utf-8",errors="ignore") as infile:
+    #
+    # The "utf-8-sig" codec drops any byte order mark, as written at the start
+    # of spreadsheets exported from Google Sheets or Excel.
+    with open(filename,newline="",encoding="utf-8-sig",errors="ignore") as infile:
         if (skip):
             infile.readline()  # skip header line
         contents = infile.read(None)
@@ -158,6 +162,60 @@ def read_spreadsheet_table(filename,skip=False,debug=False):
             
     return table
 
+def iter_spreadsheet_dictionary(filename,fieldnames,skip=True,replace_newlines=True,restval=None,debug=False):
+    """Iterate over entries of CSV spreadsheet as dictionaries.
+
+    Entries are cleaned up and yielded one at a time, so that they may be
+    filtered (e.g., to remove test submissions) without first building the
+    full table.  See read_spreadsheet_dictionary for details.
+
+    Arguments:
+        filename (string) : filename for spreadsheet to open
+        fieldnames (list) : list of field names
+        skip (boolean, optional) : whether or not to skip first line
+        replace_newlines (boolean, optional) : whether or not to replace newlines in entries
+        restval (any, optional) : default value for missing field (as for csv.DictReader)
+        debug (boolean, optional) : whether or not to print debugging
+            info on each input line
+
+    Yields:
+        (dictionary) : entry
+
+    """
+
+    # clean up input stream
+    clean_stream = read_spreadsheet_clean_stream(filename,skip=skip,debug=debug)
+
+    # parse spreadsheet
+    #
+    # Rows are read with csv.reader and zipped directly against the field
+    # names, rather than going through csv.DictReader, but with the same
+    # conventions: blank lines are skipped, overrun fields are aggregated
+    # into a list under key None, and missing fields are set to restval.
+    reader = csv.reader(clean_stream)
+    num_fields = len(fieldnames)
+
+    # intern field names, since they serve as keys in every entry
+    fieldnames = [sys.intern(field) for field in fieldnames]
+
+    # clean up entries
+    for row in reader:
+        if (row==[]):
+            continue
+        clean_entry = {
+            field: clean_up(value,replace_newlines)
+            for (field,value) in zip(fieldnames,row)
+        }
+        if (len(row)>num_fields):
+            clean_entry[None] = clean_up(row[num_fields:],replace_newlines)
+        elif (len(row)<num_fields):
+            clean_value = clean_up(restval,replace_newlines)
+            for field in fieldnames[len(row):]:
+                clean_entry[field] = clean_value
+        if (debug):
+            print(clean_entry)
+        yield clean_entry
+
 def read_spreadsheet_dictionary(filename,fieldnames,skip=True,replace_newlines=True,restval=None,debug=False):
     """Read CSV spreadsheet into list of dictionaries.
 
@@ -177,7 +235,7 @@ def read_spreadsheet_dictionary(filename,fieldnames,skip=True,replace_newlines=T
         fieldnames (list) : list of field names
         skip (boolean, optional) : whether or not to skip first line
         replace_newlines (boolean, optional) : whether or not to replace newlines in entries
-        restval (any, optional) : default value for missing field (pass-through parameter to csv.DictReader)
+        restval (any, optional) : default value for missing field (as for csv.DictReader)
         debug (boolean, optional) : whether or not to print debugging
             info on each input line
 
@@ -186,26 +244,10 @@ def read_spreadsheet_dictionary(filename,fieldnames,skip=True,replace_newlines=T
 
     """
 
-    # clean up input stream
-    clean_stream = read_spreadsheet_clean_stream(filename,skip=skip,debug=debug)
-
-    # parse spreadsheet
-    reader = csv.DictReader(clean_stream,fieldnames=fieldnames,restval=restval)
-
-    # clean up entries
-    data = []
-    for entry in reader:
-        if (debug):
-            print(entry)
-        clean_entry = {}
-        for field in entry:
-            clean_entry[field]=clean_up(entry[field],replace_newlines)
-        data.append(clean_entry)
-
-        ## for (key,value) in entry.items():
-        ##     print("{} {}",key,value)
-
-            
+    data = list(iter_spreadsheet_dictionary(
+        filename,fieldnames,
+        skip=skip,replace_newlines=replace_newlines,restval=restval,debug=debug
+    ))
     return data
 
 
@@ -242,6 +284,30 @@ def convert_fields_to_flags(dict,keys,padding=" "):
         if (dict[key]!=""):
             dict[key] = key+padding
 
+def convert_table_fields_to_flags(table,keys,padding=" "):
+    """Replace contents of nonnull fields with field name, for all rows of table.
+
+    Equivalent to calling convert_fields_to_flags on each row, but proceeds
+    column by column, so that each flag string is constructed only once and
+    shared by all rows.
+
+    Arguments:
+        table (list of dictionary) : rows on which to do this substitution
+        keys (list) : list of keys to be so replaced
+        padding (string,optional) : terminal padding
+
+    Example:
+
+        >>> google_forms.convert_table_fields_to_flags(table,boolean_field_names)
+
+    """
+
+    for key in keys:
+        flag = key+padding
+        for row in table:
+            if (row[key]!=""):
+                row[key] = flag
+
 def convert_fields_to_tagged_lines(dict,keys,prefix="",padding="\n",prune=False):
     """Tag contents of fields with field name, optionally suppressing null
     fields.
@@ -270,8 +336,10 @@ def convert_fields_to_tagged_lines(dict,keys,prefix="",padding="\n",prune=False)
     """
 
     for key in keys:
-        if (not (prune and (dict[key]==""))):
-            dict[key] = "{}{}: {}{}".format(prefix,key,dict[key],padding)
+        value = dict[key]
+        if (prune and (value=="")):
+            continue
+        dict[key] = "{}{}: {}{}".format(prefix,key,value,padding)
 
 def split_checkbox_responses(dict,keys,delimiter=";",prefix="   ",padding="\n"):
     """Break out comma-delimited responses into indented (or prefixed)
@@ -286,9 +354,10 @@ def split_checkbox_responses(dict,keys,delimiter=";",prefix="   ",padding="\n"):
     """
     for key in keys:
         if (dict[key].strip()==""):
-            values = []  # prevent spurious "".split(";") => [""]
-        else:
-            values = dict[key].split(delimiter)
+            # short circuit empty field (and prevent spurious "".split(";") => [""])
+            dict[key] = ""
+            continue
+        values = dict[key].split(delimiter)
         values = [
             "{}{}{}".format(prefix,value,padding)
             for value in values
@@ -424,6 +493,10 @@ def nanmedian(values):
 # export functions
 ################################################################
 
+# buffer size for report output streams, large enough that a typical report
+# is flushed to disk in a single write
+OUTPUT_BUFFER_SIZE = 2**20
+
 def write_table(filename,data,format_spec=None,debug=False):
     """ Write table to CSV file.
 
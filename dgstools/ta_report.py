@@ -0,0 +1,396 @@
+"""ta_report.py
+
+Generate reports from TA preference and feedback form responses.
+
+This module provides the common processing for the extract-ta-*.py scripts,
+each of which is a thin wrapper which reads the configuration file
+"extract-ta.yml" and calls the corresponding run function.
+
+Requires: PyYAML
+
+Language: Python 3
+
+"""
+
+import operator
+import sys
+
+import spreadsheet
+
+################################################################
+# faculty TA feedback
+################################################################
+
+# Google spreadsheet column headers (21a):
+#
+#   "Timestamp"
+#   "Username"
+#   "Course number (PHYS XXXXX)"
+#   "Course name"
+#   "Last name"
+#   "First name"
+#   "Role"
+#   "Special identifications (optional)"
+#   "Comments (to be shared with TA)"
+
+faculty_feedback_field_names = [
+    "timestamp","username",
+    "number","name",
+    "last","first",
+    "role","special",
+    "comments"
+]
+
+# columns with values repeated across many responses (interned on input)
+faculty_feedback_interned_field_names = ["role","number","name","username"]
+
+faculty_feedback_block_template = (
+    "{last}, {first}\n"
+    "Course: PHYS {number} / {name} / {username}\n"
+    "Role: {role}\n"
+    "Special: {short_special}\n"
+    "Comments: {comments}\n"
+    "\n"
+)
+
+def run_faculty_feedback(config):
+    """Extract faculty end-of-semester TA feedback/evaluations.
+
+    Arguments:
+        config (dict) : configuration parameters (from "extract-ta.yml")
+    """
+
+    response_filename = config["response_filename_faculty_feedback"]
+    term = config["term"]
+    report_filename = "ta-faculty-feedback-{}.txt".format(term)
+    print("{} -> {}".format(response_filename,report_filename))
+
+    # read responses
+    table = spreadsheet.iter_spreadsheet_dictionary(
+        response_filename,
+        faculty_feedback_field_names,
+        skip=True
+    )
+
+    # filter out test submissions
+    table = [row for row in table if row["last"]!="TEST"]
+
+    # share storage for repeated values, and set up sort keys
+    #
+    # The (case-insensitive) sort key is stored with each entry, as
+    # "sort_key", so that the names are uppercased just once per entry.  The
+    # abbreviated special-assignment field is likewise stored with the entry,
+    # as "short_special", for use by the report template.
+    for row in table:
+        for field in faculty_feedback_interned_field_names:
+            row[field] = sys.intern(row[field])
+        row["sort_key"] = (row["last"].upper(),row["first"].upper(),row["number"],row["timestamp"])
+        row["short_special"] = row["special"].split(",")[0]
+
+    # sort by (lastname, firstname, course, timestamp)
+    table.sort(key=operator.itemgetter("sort_key"))
+
+    # generate report
+    report_blocks = []
+    for row in table:
+        ## print(row)
+        report_blocks.append(faculty_feedback_block_template.format_map(row))
+
+    # write report
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("".join(report_blocks))
+
+################################################################
+# faculty TA preferences
+################################################################
+
+# Google spreadsheet column headers (21a):
+#
+#   "Timestamp"
+#   "Username"
+#   "Last name"
+#   "First name"
+#   "Course ID (PHYS XXXXX)"
+#   "Course name"
+#   "Expected enrollment"
+#   "COVID-19 special considerations"  [SPECIAL]
+#   "Common TA assignments [HW grading from provided solutions (how often?)]"
+#   "Common TA assignments [Written/essay HW grading (how often?)]"
+#   "Common TA assignments [Assist in exam grading (how many exams?)]"
+#   "Common TA assignments [Evening help or tutorial sessions (how often?)]"
+#   "Common TA assignments [Office hours (how many hours per week?)]"
+#   "Common TA assignments: Details"
+#   "Uncommon TA assignments [Preparing solutions for HW assignments (how often?)]"
+#   "Uncommon TA assignments [Preparing solutions for and grading exams (how many exams?)]"
+#   "Uncommon TA assignments [Attending lectures (what frequency?)]"
+#   "Uncommon TA assignments [Other (describe below)]"
+#   "Uncommon TA assignments: Details"
+#   "Other specific requests"
+
+faculty_preferences_field_names = [
+    "timestamp","username",
+    "last","first",
+    "number","name",
+    "enrollment",
+    "GH","GW","GE","H","O","common",  # note HO were combined in TA survey
+    "GH-NS","GE-NS","A","X","uncommon",  # caveat: "GH-NS" didn't actually say "grading"
+    "other"
+]
+faculty_preferences_boolean_field_names = ["GH","GW","GE","H","O","GH-NS","GE-NS","A","X"]
+
+faculty_preferences_block_template = (
+    "{last}, {first}\n"
+    "Course: {number} / {name} ({enrollment})\n"
+    "Common: {GH}{GW}{GE}{H}{O}\n"
+    "Notes: {common}\n"
+    "Uncommon: {GH-NS}{GE-NS}{A}{X}\n"
+    "Notes: {uncommon}\n"
+    "Other: {other}\n"
+    "\n"
+)
+
+def run_faculty_preferences(config):
+    """Extract faculty TA preference questionnaire responses.
+
+    Arguments:
+        config (dict) : configuration parameters (from "extract-ta.yml")
+    """
+
+    response_filename = config["response_filename_faculty_preferences"]
+    term = config["term"]
+    report_filename = "ta-faculty-preferences-{}.txt".format(term)
+    print("{} -> {}".format(response_filename,report_filename))
+
+    # read responses
+    table = spreadsheet.iter_spreadsheet_dictionary(response_filename,faculty_preferences_field_names,skip=True)
+
+    # filter out test submissions
+    table = [row for row in table if (row["last"]!="TEST") and (row["name"]!="TEST")]
+
+    # sort by (lastname, firstname)
+    for row in table:
+        row["sort_key"] = (row["last"].upper(),row["first"].upper())
+    table.sort(key=operator.itemgetter("sort_key"))
+
+    # process radio buttons
+    spreadsheet.convert_table_fields_to_flags(table,faculty_preferences_boolean_field_names)
+
+    # add respondent name summary (used in reminder e-mail)
+    submitters = [
+        row["last"].title()
+        for row in table
+    ]
+    unique_submitters = sorted(list(set(submitters)))
+    report_blocks = ["Submitted: {}\n\n".format(", ".join(unique_submitters))]
+
+    # generate report
+    for row in table:
+        ## print(row)
+        report_blocks.append(faculty_preferences_block_template.format_map(row))
+
+    # write report
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("".join(report_blocks))
+
+################################################################
+# student TA feedback
+################################################################
+
+# Google spreadsheet column headers (21b...):
+#    
+#    "Timestamp"
+#    "Username"
+#    "Last name"
+#    "First name"
+#    "Course name"
+#    "Course number (PHYS XXXXX)"
+#    "Lab preparation and setup"
+#    "Lab contact hours"
+#    "Lab report grading"
+#    "Tutorial preparation"
+#    "Tutorial contact hours"
+#    "Tutorial exercise grading"
+#    "Homework grading from provided solutions"
+#    "Written/essay homework grading"
+#    "Exam grading from provided solutions"
+#    "Assisting in proctoring exams (under supervision of instructor)"
+#    "Office hours or help sessions"
+#    "Homework grading without solutions (and/or preparing homework solutions)"
+#    "Exam grading without solutions (and/or preparing exam solutions)"
+#    "Proctoring exams without supervision of instructor"
+#    "Attending lectures"
+#    "Other"
+#    "Please share any feedback you may have on the TA responsibilities and the TA assignment process."
+
+student_feedback_field_names = [
+    "timestamp","username",
+    "last","first",
+    "name","number",
+    "Lab-prep","Lab-contact","Lab-grading",
+    "Tut-prep","Tut-contact","Tut-grading",
+    "HW-grading","Written-grading","Exam-grading","Proctoring","Office-help",
+    "HW-grading-NS","Exam-grading-NS","Proctoring-NS","Attending","Other",
+    "comments"
+]
+student_feedback_tagged_line_field_names = [
+    "Lab-prep","Lab-contact","Lab-grading",
+    "Tut-prep","Tut-contact","Tut-grading",
+    "HW-grading","Written-grading","Exam-grading","Proctoring","Office-help",
+    "HW-grading-NS","Exam-grading-NS","Proctoring-NS","Attending","Other",
+]
+
+student_feedback_block_template = (
+    "{last}, {first}\n"
+    "Course: {number}\n"
+    "{Lab-prep}{Lab-contact}{Lab-grading}"
+    "{Tut-prep}{Tut-contact}{Tut-grading}"
+    "{HW-grading}{Written-grading}{Exam-grading}{Proctoring}{Office-help}"
+    "{HW-grading-NS}{Exam-grading-NS}{Proctoring-NS}{Attending}{Other}"
+    "Comments: {comments}\n"
+    "\n"
+)
+
+def run_student_feedback(config):
+    """Extract TA end-of-semester feedback questionnaire responses.
+
+    Arguments:
+        config (dict) : configuration parameters (from "extract-ta.yml")
+    """
+
+    response_filename = config["response_filename_student_feedback"]
+    term = config["term"]
+    report_filename = "ta-student-feedback-{}.txt".format(term)
+    print("{} -> {}".format(response_filename,report_filename))
+
+    # read responses
+    table = spreadsheet.iter_spreadsheet_dictionary(
+        response_filename,
+        student_feedback_field_names,
+        skip=True
+    )
+
+    # filter out test submissions, set up sort keys, and process tagged lines
+    #
+    # These are all done in a single pass, as the responses are read.  The
+    # (case-insensitive) sort key is stored with each entry, as "sort_key", so
+    # the sort itself needs only a C-level itemgetter.
+    processed_table = []
+    for row in table:
+        if (row["last"]=="TEST"):
+            continue
+        row["sort_key"] = (row["last"].upper(),row["first"].upper(),row["timestamp"])
+        spreadsheet.convert_fields_to_tagged_lines(
+            row,student_feedback_tagged_line_field_names,prune=True
+        )
+        processed_table.append(row)
+    table = processed_table
+
+    # sort by (lastname, firstname, timestamp)
+    table.sort(key=operator.itemgetter("sort_key"))
+
+    # generate report
+    report_blocks = []
+    for row in table:
+        report_blocks.append(student_feedback_block_template.format_map(row))
+
+    # write report
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("".join(report_blocks))
+
+################################################################
+# student TA preferences
+################################################################
+
+# Google spreadsheet column headers (19a):
+#
+#   "Timestamp"
+#   "Username"
+#   "Last name"
+#   "First Name"
+#   "My preferred type(s) of TA assignments are:"
+#   "Class conflicts"
+#   "Seminar conflicts"
+#   "Additional considerations"
+#   "Is there a professor with whom you would have difficulty working?"
+
+student_preferences_field_names = [
+    "timestamp","username",
+    "last","first",
+    "preferred",
+    "class-conflict",
+    "sem-conflict",
+    "other",
+    "exclude"
+]
+student_preferences_checkbox_newline_field_names = [
+    "preferred",
+    "class-conflict",
+    "sem-conflict",
+]
+
+student_preferences_block_template = (
+    "{last}, {first}\n"
+    "Preferred types:\n"
+    "{preferred}"
+    "Conflicts:\n"
+    "{class-conflict}"
+    "{sem-conflict}"
+    "Other: {other}\n"
+    "Exclude: {exclude}\n"
+    "\n"
+)
+
+def run_student_preferences(config):
+    """Extract TA preference questionnaire responses.
+
+    Arguments:
+        config (dict) : configuration parameters (from "extract-ta.yml")
+    """
+
+    response_filename = config["response_filename_student_preferences"]
+    term = config["term"]
+    report_filename = "ta-student-preferences-{}.txt".format(term)
+    print("{} -> {}".format(response_filename,report_filename))
+
+    # read responses
+    table = spreadsheet.iter_spreadsheet_dictionary(
+        response_filename,
+        student_preferences_field_names,
+        skip=True
+    )
+
+    # filter out test submissions
+    table = [row for row in table if row["last"]!="TEST"]
+
+    # sort by (lastname, firstname)
+    #
+    # The (case-insensitive) sort key is stored with each entry, as
+    # "sort_key", so the sort itself needs only a C-level itemgetter.
+    for row in table:
+        row["sort_key"] = (row["last"].upper(),row["first"].upper())
+    table.sort(key=operator.itemgetter("sort_key"))
+
+    # process tagged lines and generate report tabulation (in a single pass)
+    report_blocks = []
+    for row in table:
+        spreadsheet.split_checkbox_responses(
+            row,student_preferences_checkbox_newline_field_names
+        )
+        ## print(row)
+        report_blocks.append(student_preferences_block_template.format_map(row))
+
+    # write report
+    with open(report_filename,"w",buffering=spreadsheet.OUTPUT_BUFFER_SIZE,encoding="utf-8") as report_stream:
+        report_stream.write("".join(report_blocks))
+
+################################################################
+# report registry
+################################################################
+
+# run functions by report name (as given on the extract-ta.py command line)
+run_function_by_report = {
+    "faculty-feedback": run_faculty_feedback,
+    "faculty-preferences": run_faculty_preferences,
+    "student-feedback": run_student_feedback,
+    "student-preferences": run_student_preferences,
+}